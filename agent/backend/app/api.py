@@ -1,10 +1,12 @@
 ﻿from __future__ import annotations
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Optional, Literal
 
 from fastapi import APIRouter, Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 
 from .settings import Settings, get_settings
@@ -473,8 +475,14 @@ async def app_lifespan(app: FastAPI):
     logger.info("Graph MCP API shutdown complete")
 
 
+@lru_cache(maxsize=None)
 def build_app(*, lifespan: Optional[Any] = None) -> FastAPI:
-    """Build FastAPI application with proper lifespan management."""
+    """Build FastAPI application with proper lifespan management.
+
+    Cached per lifespan argument so repeated default calls (module
+    singleton, test fixtures) share one app instead of re-running route
+    registration and pydantic schema construction.
+    """
     # Use our lifespan if none provided
     if lifespan is None:
         from contextlib import asynccontextmanager
@@ -490,7 +498,10 @@ def build_app(*, lifespan: Optional[Any] = None) -> FastAPI:
         title="Graph MCP API",
         description="Network security graph analysis with MCP integration",
         version="1.0.0",
-        lifespan=lifespan
+        lifespan=lifespan,
+        # orjson serializes response bodies in C, skipping the
+        # jsonable_encoder + stdlib json path for plain-dict returns
+        default_response_class=ORJSONResponse,
     )
 
     # Add global exception handler
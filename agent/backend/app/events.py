@@ -1,16 +1,26 @@
 ﻿from __future__ import annotations
 
 import asyncio
+import itertools
+import logging
 import uuid
+
+import orjson
 from datetime import datetime, timezone
 from typing import Any, Iterable, Optional, Set
 
 from fastapi import WebSocket
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
+# Event ids only need to be unique within the process; a counter avoids
+# the urandom read + UUID allocation that uuid4 pays per event.
+_event_ids = itertools.count(1)
+
 
 class AgentEvent(BaseModel):
-    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    id: str = Field(default_factory=lambda: f"e{next(_event_ids):x}")
     type: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), alias="createdAt")
     payload: Any = Field(default_factory=dict)
@@ -29,6 +39,9 @@ class Connection:
     def __init__(self, websocket: WebSocket):
         self.websocket = websocket
         self.id = uuid.uuid4().hex
+        # Payload dicts, or pre-encoded frames (str) from the broadcast path
+        self.outbox: asyncio.Queue[dict[str, Any] | str] = asyncio.Queue()
+        self._writer: Optional[asyncio.Task[None]] = None
 
     def __hash__(self) -> int:  # pragma: no cover - trivial
         return hash(self.id)
@@ -42,34 +55,88 @@ class Connection:
         payload = event.as_dict() if isinstance(event, AgentEvent) else event
         await self.websocket.send_json(payload)
 
+    def enqueue(self, event: AgentEvent | dict[str, Any] | str) -> None:
+        """Queue a payload — or an already-encoded frame — for the writer task."""
+        if isinstance(event, AgentEvent):
+            event = event.as_dict()
+        self.outbox.put_nowait(event)
+
+    async def _drain_outbox(self) -> None:
+        # Grab the first payload, then drain whatever queued up behind it so
+        # bursts are written back-to-back on one wake-up. Each payload stays
+        # its own frame — the frontends parse one AgentEvent per frame — so
+        # the win here is the single orjson encode per payload and fewer
+        # queue waits, not frame coalescing.
+        try:
+            while True:
+                batch = [await self.outbox.get()]
+                while True:
+                    try:
+                        batch.append(self.outbox.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                for payload in batch:
+                    if not isinstance(payload, str):
+                        payload = orjson.dumps(payload).decode()
+                    await self.websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Without this, a failed send kills the task silently and its
+            # exception is never retrieved; the read loop in the endpoint
+            # notices the dead socket and unregisters the connection.
+            logger.warning("WebSocket writer for connection %s stopped: %s", self.id, exc)
+
+    def start_writer(self) -> None:
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._drain_outbox())
+
+    def stop_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+
 
 class EventBroker:
     def __init__(self) -> None:
         self._connections: Set[Connection] = set()
+        # Immutable view rebuilt on (un)register only, so broadcast can
+        # iterate without taking the lock or copying the set per event.
+        self._connections_snapshot: tuple[Connection, ...] = ()
         self._lock = asyncio.Lock()
 
     async def register(self, websocket: WebSocket) -> Connection:
         # WebSocket is already accepted in the endpoint handler
         connection = Connection(websocket)
+        connection.start_writer()
         async with self._lock:
             self._connections.add(connection)
+            self._connections_snapshot = tuple(self._connections)
         return connection
 
     async def unregister(self, connection: Connection) -> None:
+        connection.stop_writer()
         async with self._lock:
             self._connections.discard(connection)
+            self._connections_snapshot = tuple(self._connections)
 
     async def broadcast(self, event: AgentEvent | dict[str, Any]) -> None:
+        connections: Iterable[Connection] = self._connections_snapshot
+        if not connections:
+            return
         payload = event if isinstance(event, dict) else event.as_dict()
-        async with self._lock:
-            connections: Iterable[Connection] = list(self._connections)
+        # Encode once and hand the same pre-encoded frame to every
+        # connection's outbox: each socket keeps a single writer (no
+        # interleaving with the drain task), and a slow consumer only backs
+        # up its own queue instead of stalling emit for everyone else. Dead
+        # sockets are unregistered by their endpoint's read loop.
+        encoded = orjson.dumps(payload).decode()
         for connection in connections:
-            try:
-                await connection.send(payload)
-            except Exception:
-                await self.unregister(connection)
+            connection.enqueue(encoded)
 
     async def emit(self, event_type: str, payload: Any, *, level: Optional[str] = None, source: Optional[str] = None) -> None:
+        if not self._connections_snapshot:
+            return
         await self.broadcast(AgentEvent(type=event_type, payload=payload, level=level, source=source))
 
 
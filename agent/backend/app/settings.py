@@ -8,6 +8,9 @@ from pydantic import BaseModel
 
 
 class Settings(BaseModel):
+    class Config:
+        frozen = True
+
     neo4j_uri: Optional[str] = None
     neo4j_user: Optional[str] = None
     neo4j_password: Optional[str] = None
@@ -1,360 +1,475 @@
-from __future__ import annotations
-
-import json
-import logging
-import uuid
-from datetime import datetime
-from enum import Enum
-from typing import Dict, Any, Optional
-
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-
-
-class WebSocketErrorType(str, Enum):
-    """Enumeration of WebSocket error types for structured error handling."""
-    JSON_DECODE = "json_decode_error"
-    AGENT_INITIALIZATION = "agent_initialization_error"
-    AGENT_EXECUTION = "agent_execution_error"
-    MESSAGE_VALIDATION = "message_validation_error"
-    INTERNAL_ERROR = "internal_error"
-    CONNECTION_ERROR = "connection_error"
-try:
-    from langchain_core.messages import HumanMessage
-    LANGCHAIN_AVAILABLE = True
-except ImportError:  # pragma: no cover - optional dependency
-    LANGCHAIN_AVAILABLE = False
-
-    class HumanMessage:  # type: ignore
-        def __init__(self, content: str):
-            self.content = content
-
-try:
-    from ...flow import create_application
-    FLOW_AVAILABLE = True
-except ImportError:  # pragma: no cover - optional dependency
-    FLOW_AVAILABLE = False
-    create_application = None  # type: ignore
-
-from .events import get_broker, EventBroker
-from ...mcp_integration import Neo4jMCPClient
-
-router = APIRouter()
-logger = logging.getLogger(__name__)
-
-if not LANGCHAIN_AVAILABLE:
-    logger.warning("langchain_core not available; using simple HumanMessage stub")
-
-
-def get_agent_app_from_state(websocket: WebSocket):
-    """Get agent application from FastAPI app state."""
-    if not hasattr(websocket.app.state, 'agent_app'):
-        logger.warning("Agent app not initialized in app state")
-        return None
-    return websocket.app.state.agent_app
-
-
-async def send_error_message(
-    websocket: WebSocket,
-    error_type: WebSocketErrorType,
-    message: str,
-    recoverable: bool = True,
-    retry_after_ms: Optional[int] = None
-) -> None:
-    """Send structured error message to client with reconnection metadata."""
-    error_payload = {
-        "type": "error",
-        "payload": {
-            "error_type": error_type.value,
-            "message": message,
-            "recoverable": recoverable,
-            "timestamp": datetime.now().isoformat()
-        }
-    }
-
-    if retry_after_ms is not None:
-        error_payload["payload"]["retry_after_ms"] = retry_after_ms
-
-    try:
-        await websocket.send_text(json.dumps(error_payload))
-    except Exception as e:
-        logger.error(f"Failed to send error message: {e}")
-
-
-async def handle_agent_message(websocket: WebSocket, message: Dict[str, Any], broker: EventBroker):
-    """Handle agent chat messages and invoke LangGraph agent."""
-    message_type = message.get("type")
-    command = message.get("command")
-    payload = message.get("payload", {})
-
-    if message_type == "agent.command" and command == "chat":
-        # Extract user message from the chat command
-        user_message = payload.get("text", "").strip()
-    elif message_type == "agent.message":
-        # Extract user message from agent.message type
-        user_message = payload.get("message", "").strip()
-    else:
-        user_message = None
-
-    if user_message:
-        logger.info(f"Processing user message: '{user_message}' (type: {message_type}, command: {command})")
-
-        # Send acknowledgment
-        await websocket.send_text(json.dumps({
-            "id": f"log-{int(datetime.now().timestamp() * 1000)}",
-            "type": "agent.log",
-            "createdAt": datetime.now().isoformat(),
-            "payload": {
-                "message": f"Processing: {user_message}"
-            },
-            "level": "info"
-        }))
-
-        # Try to invoke the real LangGraph agent
-        try:
-            logger.info("Getting agent application from app state...")
-            agent_app = get_agent_app_from_state(websocket)
-            if agent_app and agent_app.graph:
-                logger.info("Agent available, invoking LangGraph...")
-
-                configurable: Dict[str, Any] = {}
-
-                thread_id = payload.get("thread_id") or getattr(websocket.state, "thread_id", None)
-                if not thread_id:
-                    thread_id = getattr(websocket.state, "connection_id", None)
-                if not thread_id:
-                    thread_id = uuid.uuid4().hex
-                websocket.state.thread_id = thread_id
-                configurable["thread_id"] = thread_id
-
-                checkpoint_ns = payload.get("checkpoint_ns") or getattr(websocket.state, "checkpoint_ns", None)
-                if checkpoint_ns:
-                    configurable["checkpoint_ns"] = checkpoint_ns
-                    websocket.state.checkpoint_ns = checkpoint_ns
-
-                checkpoint_id = payload.get("checkpoint_id")
-                if checkpoint_id:
-                    configurable["checkpoint_id"] = checkpoint_id
-
-                graph_config = {"configurable": configurable}
-
-                logger.info(f"Using LangGraph config: {graph_config}")
-
-                # Create a proper agent state with the user message
-                agent_input = {
-                    "messages": [HumanMessage(content=user_message)]
-                }
-                logger.info(f"Agent input prepared: {agent_input}")
-
-                # Invoke the agent with streaming to capture each node execution
-                logger.info("Invoking agent.graph.astream...")
-                print("Starting LangGraph execution with streaming...")
-
-                # Stream events to see each node execution
-                final_result = None
-                async for event in agent_app.graph.astream(agent_input, config=graph_config):
-                    node_name = list(event.keys())[0] if event else "unknown"
-                    print(f"LangGraph Node: {node_name}")
-                    logger.info(f"Executing node: {node_name}")
-                    logger.debug(f"   Node output: {event}")
-                    final_result = event
-
-                # Get the final state
-                result = final_result if final_result else {}
-                logger.info(f"Agent execution completed. Result keys: {list(result.keys()) if isinstance(result, dict) else type(result)}")
-                print(f"LangGraph execution completed")
-
-                # Extract the response from the agent result
-                if "messages" in result and result["messages"]:
-                    last_message = result["messages"][-1]
-                    response = last_message.content if hasattr(last_message, 'content') else str(last_message)
-                    logger.info(f"Agent response extracted: {response[:100]}...")
-                else:
-                    response = "Agent completed processing but no response was generated."
-                    logger.warning("No messages in agent result")
-
-                logger.info("Sending agent response to WebSocket")
-            else:
-                # Fallback to enhanced mock response if agent creation failed
-                logger.warning("Using mock response - agent not available")
-                response = await generate_agent_response(user_message)
-
-        except Exception as e:
-            logger.error(f"Error invoking agent: {e}", exc_info=True)
-            # Send structured error with retry guidance
-            await send_error_message(
-                websocket,
-                WebSocketErrorType.AGENT_EXECUTION,
-                f"Agent execution failed: {str(e)}",
-                recoverable=True,
-                retry_after_ms=1000
-            )
-            # Fallback to mock response
-            response = await generate_agent_response(user_message)
-
-        # Send agent response
-        await websocket.send_text(json.dumps({
-            "id": f"msg-{int(datetime.now().timestamp() * 1000)}",
-            "type": "agent.message",
-            "createdAt": datetime.now().isoformat(),
-            "payload": {
-                "role": "assistant",
-                "content": response
-            }
-        }))
-
-    elif message_type == "graph.request":
-        # Handle graph data requests
-        await websocket.send_text(json.dumps({
-            "type": "graph.data",
-            "payload": {
-                "nodes": [],
-                "edges": []
-            }
-        }))
-
-    else:
-        # Handle empty user message or unknown message types
-        if not user_message and message_type in ["agent.command", "agent.message"]:
-            await websocket.send_text(json.dumps({
-                "type": "agent.log",
-                "payload": {
-                    "message": "Please provide a message to process",
-                    "level": "warning"
-                }
-            }))
-        else:
-            # Unknown message type
-            await websocket.send_text(json.dumps({
-                "type": "agent.log",
-                "payload": {
-                    "message": f"Unknown message type: {message_type} (command: {command})",
-                    "level": "warning"
-                }
-            }))
-
-
-async def generate_agent_response(user_message: str) -> str:
-    """Generate a mock agent response based on user input."""
-    message_lower = user_message.lower()
-
-    if any(word in message_lower for word in ["simulation", "attack", "scenario"]):
-        return (
-            "I can help you run attack simulations! Here are some options:\n\n"
-            "- **Lateral Movement**: Simulate attacker movement between systems\n"
-            "- **Privilege Escalation**: Test elevation of privileges\n"
-            "- **Data Exfiltration**: Analyze data theft scenarios\n"
-            "- **Persistence**: Evaluate long-term access methods\n\n"
-            "To start a simulation, try: 'Run a lateral movement simulation'"
-        )
-
-    elif any(word in message_lower for word in ["graph", "topology", "network"]):
-        return (
-            "I can analyze your network topology! To get started:\n\n"
-            "1. **Upload a graph**: Use the 'Upload Graph JSON' button\n"
-            "2. **Load sample data**: Click 'Load Sample Graph' for a demo\n"
-            "3. **Run queries**: Use the Cypher panel to explore your data\n\n"
-            "Try loading the sample graph to see a network visualization."
-        )
-
-    elif any(word in message_lower for word in ["cypher", "query", "search"]):
-        return (
-            "You can use Cypher queries to explore your graph data:\n\n"
-            "**Common queries:**\n"
-            "```\n"
-            "MATCH (n) RETURN n LIMIT 10\n"
-            "MATCH (n)-[r]->(m) RETURN n, r, m LIMIT 5\n"
-            "```\n\n"
-            "The query results will appear below the Cypher panel."
-        )
-
-    elif any(word in message_lower for word in ["help", "how", "what", "?"]):
-        return (
-            "Welcome to the **Graph Scenario Workbench**!\n\n"
-            "**What I can help with:**\n"
-            "- **Graph analysis** - upload and visualize network topologies\n"
-            "- **Attack simulations** - run cybersecurity scenarios\n"
-            "- **Cypher queries** - explore graph data with Neo4j queries\n"
-            "- **Real-time monitoring** - track simulation progress\n\n"
-            "**Quick start:** Try 'Load sample graph' to see the visualization!"
-        )
-    else:
-        return (
-            f"I understand you're asking about: *{user_message}*\n\n"
-            "I'm a cybersecurity agent focused on graph analysis and attack simulations. "
-            "For best results, try queries about:\n"
-            "- Network topology analysis\n"
-            "- Attack scenario planning\n"
-            "- Graph data exploration\n\n"
-            "Type 'help' for more information!"
-        )
-
-
-@router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    logger.info("WebSocket endpoint hit")
-    print("WebSocket endpoint hit")
-
-    broker = get_broker()
-    connection = None
-
-    try:
-        logger.info("Accepting WebSocket connection...")
-        await websocket.accept()
-        logger.info("WebSocket accepted, registering with broker...")
-        connection = await broker.register(websocket)
-        websocket.state.connection = connection
-        websocket.state.connection_id = connection.id
-        if not getattr(websocket.state, 'thread_id', None):
-            websocket.state.thread_id = connection.id
-
-        # Agent app is already initialized in app.state by lifespan
-        logger.info("WebSocket connected - agent app available from app.state")
-
-        logger.info("Entering WebSocket message loop")
-        while True:
-            try:
-                # Keep the connection alive by waiting for messages
-                logger.info("Waiting for WebSocket message...")
-                data = await websocket.receive_text()
-                logger.info(f"WebSocket received message: {data[:200]}...")
-
-                # Parse and handle agent messages
-                try:
-                    message = json.loads(data)
-                    logger.info(f"Parsed WebSocket message: type={message.get('type')}, command={message.get('command')}")
-                    await handle_agent_message(websocket, message, broker)
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}")
-                    await send_error_message(
-                        websocket,
-                        WebSocketErrorType.JSON_DECODE,
-                        "Invalid JSON format in message",
-                        recoverable=True
-                    )
-            except WebSocketDisconnect:
-                logger.info("WebSocket client disconnected normally")
-                break
-            except Exception as e:
-                logger.error(f"WebSocket error during receive: {e}", exc_info=True)
-                # Send structured error with reconnection hint
-                await send_error_message(
-                    websocket,
-                    WebSocketErrorType.INTERNAL_ERROR,
-                    f"Internal server error: {str(e)}",
-                    recoverable=True,
-                    retry_after_ms=5000  # Suggest reconnect after 5 seconds
-                )
-                break
-
-    except Exception as e:
-        logger.error(f"WebSocket connection error: {e}", exc_info=True)
-        try:
-            await websocket.close(code=1011, reason="Internal server error")
-        except:
-            pass
-    finally:
-        if connection:
-            try:
-                await broker.unregister(connection)
-            except Exception as e:
-                logger.error(f"Error unregistering WebSocket connection: {e}")
+from __future__ import annotations
+
+import json
+import logging
+import re
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Any, Optional
+
+import orjson
+
+from fastapi import APIRouter, WebSocket
+
+
+class WebSocketErrorType(str, Enum):
+    """Enumeration of WebSocket error types for structured error handling."""
+    JSON_DECODE = "json_decode_error"
+    AGENT_INITIALIZATION = "agent_initialization_error"
+    AGENT_EXECUTION = "agent_execution_error"
+    MESSAGE_VALIDATION = "message_validation_error"
+    INTERNAL_ERROR = "internal_error"
+    CONNECTION_ERROR = "connection_error"
+try:
+    from langchain_core.messages import HumanMessage
+    LANGCHAIN_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    LANGCHAIN_AVAILABLE = False
+
+    class HumanMessage:  # type: ignore
+        def __init__(self, content: str):
+            self.content = content
+
+try:
+    from ...flow import create_application
+    FLOW_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    FLOW_AVAILABLE = False
+    create_application = None  # type: ignore
+
+from .events import get_broker, EventBroker
+from ...mcp_integration import Neo4jMCPClient
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def _encode(payload: Dict[str, Any]) -> str:
+    # orjson emits compact output (no separator whitespace) and handles
+    # datetime natively; decode because the frontend expects text frames.
+    return orjson.dumps(payload).decode()
+
+
+# Upper bound on a single inbound frame; anything larger is rejected before
+# json.loads so a hostile payload cannot pin the event loop in the parser.
+MAX_WS_MSG_BYTES = 64 * 1024
+
+# Constant frames built once at import; treat as immutable.
+_EMPTY_GRAPH_FRAME = {
+    "type": "graph.data",
+    "payload": {"nodes": [], "edges": []},
+}
+_EMPTY_PROMPT_FRAME = {
+    "type": "agent.log",
+    "payload": {"message": "Please provide a message to process", "level": "warning"},
+}
+
+if not LANGCHAIN_AVAILABLE:
+    logger.warning("langchain_core not available; using simple HumanMessage stub")
+
+
+def get_agent_app_from_state(websocket: WebSocket):
+    """Get agent application from FastAPI app state."""
+    if not hasattr(websocket.app.state, 'agent_app'):
+        logger.warning("Agent app not initialized in app state")
+        return None
+    return websocket.app.state.agent_app
+
+
+async def send_payload(websocket: WebSocket, payload: Dict[str, Any]) -> None:
+    """Send a payload through the connection's batching outbox when available.
+
+    Falls back to a direct send for sockets that were never registered with
+    the broker (e.g. before accept completes).
+    """
+    connection = getattr(websocket.state, "connection", None)
+    if connection is not None:
+        connection.enqueue(payload)
+    else:
+        await websocket.send_text(_encode(payload))
+
+
+def _error_payload(
+    error_type: WebSocketErrorType,
+    message: str,
+    recoverable: bool = True,
+    retry_after_ms: Optional[int] = None
+) -> Dict[str, Any]:
+    """Build the structured error frame shared by the send helpers."""
+    error_payload: Dict[str, Any] = {
+        "type": "error",
+        "payload": {
+            "error_type": error_type.value,
+            "message": message,
+            "recoverable": recoverable,
+            "timestamp": datetime.now().isoformat()
+        }
+    }
+
+    if retry_after_ms is not None:
+        error_payload["payload"]["retry_after_ms"] = retry_after_ms
+
+    return error_payload
+
+
+async def send_error_message(
+    websocket: WebSocket,
+    error_type: WebSocketErrorType,
+    message: str,
+    recoverable: bool = True,
+    retry_after_ms: Optional[int] = None
+) -> None:
+    """Send structured error message to client with reconnection metadata."""
+    try:
+        await send_payload(
+            websocket,
+            _error_payload(error_type, message, recoverable, retry_after_ms),
+        )
+    except Exception as e:
+        logger.error("Failed to send error message: %s", e)
+
+
+async def _handle_chat(websocket: WebSocket, message: Dict[str, Any], broker: EventBroker) -> None:
+    """Run the LangGraph agent (or the mock fallback) for a chat message."""
+    message_type = message.get("type")
+    command = message.get("command")
+    payload = message.get("payload", {})
+
+    if message_type == "agent.command" and command == "chat":
+        # Extract user message from the chat command
+        user_message = payload.get("text", "").strip()
+    elif message_type == "agent.message":
+        # Extract user message from agent.message type
+        user_message = payload.get("message", "").strip()
+    else:
+        user_message = None
+
+    if not user_message:
+        await send_payload(websocket, _EMPTY_PROMPT_FRAME)
+        return
+
+    logger.info("Processing user message: %r (type: %s, command: %s)", user_message, message_type, command)
+
+    # Send acknowledgment
+    await send_payload(websocket, {
+        "id": f"log-{int(datetime.now().timestamp() * 1000)}",
+        "type": "agent.log",
+        "createdAt": datetime.now().isoformat(),
+        "payload": {
+            "message": f"Processing: {user_message}"
+        },
+        "level": "info"
+    })
+
+    # Try to invoke the real LangGraph agent
+    try:
+        logger.info("Getting agent application from app state...")
+        agent_app = get_agent_app_from_state(websocket)
+        if agent_app and agent_app.graph:
+            logger.info("Agent available, invoking LangGraph...")
+
+            # Resolve websocket.state once; repeated LOAD_ATTR + dict
+            # probes add up on a per-message path.
+            state = websocket.state
+            thread_id = (
+                payload.get("thread_id")
+                or getattr(state, "thread_id", None)
+                or getattr(state, "connection_id", None)
+                or uuid.uuid4().hex
+            )
+            state.thread_id = thread_id
+            configurable: Dict[str, Any] = {"thread_id": thread_id}
+
+            checkpoint_ns = payload.get("checkpoint_ns") or getattr(state, "checkpoint_ns", None)
+            if checkpoint_ns:
+                configurable["checkpoint_ns"] = checkpoint_ns
+                state.checkpoint_ns = checkpoint_ns
+
+            checkpoint_id = payload.get("checkpoint_id")
+            if checkpoint_id:
+                configurable["checkpoint_id"] = checkpoint_id
+
+            graph_config = {"configurable": configurable}
+
+            logger.debug("Using LangGraph config: %s", graph_config)
+
+            # Create a proper agent state with the user message
+            agent_input = {
+                "messages": [HumanMessage(content=user_message)]
+            }
+            logger.debug("Agent input prepared: %s", agent_input)
+
+            # Invoke the agent with streaming to capture each node execution
+            logger.info("Invoking agent.graph.astream...")
+
+            # Stream events to see each node execution; per-node logging
+            # only formats when DEBUG is on, the full trace goes out as
+            # one summary event after the loop.
+            final_result = None
+            nodes_executed: list[str] = []
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            async for event in agent_app.graph.astream(agent_input, config=graph_config):
+                node_name = next(iter(event)) if event else "unknown"
+                nodes_executed.append(node_name)
+                if debug_enabled:
+                    logger.debug("node=%s output=%s", node_name, event)
+                final_result = event
+
+                # Forward new assistant content as it is produced instead of
+                # making the client wait for the whole graph; each update
+                # carries only the messages its node appended.
+                node_update = event.get(node_name) if isinstance(event, dict) else None
+                new_messages = node_update.get("messages") if isinstance(node_update, dict) else None
+                if new_messages:
+                    content = getattr(new_messages[-1], "content", None)
+                    if isinstance(content, str) and content:
+                        await send_payload(websocket, {
+                            "type": "agent.delta",
+                            "payload": {"content": content}
+                        })
+
+            await send_payload(websocket, {
+                "type": "agent.trace",
+                "payload": {"nodes": nodes_executed}
+            })
+            await send_payload(websocket, {"type": "agent.done"})
+
+            # Get the final state
+            result = final_result if final_result else {}
+            logger.info("Agent execution completed (%d result keys)", len(result) if isinstance(result, dict) else 0)
+
+            # Extract the response from the agent result
+            if "messages" in result and result["messages"]:
+                last_message = result["messages"][-1]
+                response = last_message.content if hasattr(last_message, 'content') else str(last_message)
+                logger.debug("Agent response extracted: %.100s...", response)
+            else:
+                response = "Agent completed processing but no response was generated."
+                logger.warning("No messages in agent result")
+
+            logger.info("Sending agent response to WebSocket")
+        else:
+            # Fallback to enhanced mock response if agent creation failed
+            logger.warning("Using mock response - agent not available")
+            response = await generate_agent_response(user_message)
+
+    except Exception as e:
+        # Per-message failure: skip traceback formatting, the class name
+        # and message are enough; connection-level errors keep exc_info.
+        logger.warning("Error invoking agent: %s: %s", type(e).__name__, e)
+        # Send structured error with retry guidance
+        await send_error_message(
+            websocket,
+            WebSocketErrorType.AGENT_EXECUTION,
+            f"Agent execution failed: {str(e)}",
+            recoverable=True,
+            retry_after_ms=1000
+        )
+        # Fallback to mock response
+        response = await generate_agent_response(user_message)
+
+    # Send agent response
+    await send_payload(websocket, {
+        "id": f"msg-{int(datetime.now().timestamp() * 1000)}",
+        "type": "agent.message",
+        "createdAt": datetime.now().isoformat(),
+        "payload": {
+            "role": "assistant",
+            "content": response
+        }
+    })
+
+
+
+async def _handle_graph_request(websocket: WebSocket, message: Dict[str, Any], broker: EventBroker) -> None:
+    """Answer graph data requests; no graph cache is wired up yet."""
+    await send_payload(websocket, _EMPTY_GRAPH_FRAME)
+
+
+async def _handle_unknown(websocket: WebSocket, message: Dict[str, Any], broker: EventBroker) -> None:
+    await send_payload(websocket, {
+        "type": "agent.log",
+        "payload": {
+            "message": f"Unknown message type: {message.get('type')} (command: {message.get('command')})",
+            "level": "warning"
+        }
+    })
+
+
+# One hash lookup classifies the message instead of the previous if/elif
+# chain; (type, None) entries catch types whose command does not matter.
+_DISPATCH = {
+    ("agent.command", "chat"): _handle_chat,
+    ("agent.command", None): _handle_chat,
+    ("agent.message", None): _handle_chat,
+    ("graph.request", None): _handle_graph_request,
+}
+
+
+async def handle_agent_message(websocket: WebSocket, message: Dict[str, Any], broker: EventBroker):
+    """Dispatch an incoming message to its handler by (type, command)."""
+    message_type = message.get("type")
+    handler = (
+        _DISPATCH.get((message_type, message.get("command")))
+        or _DISPATCH.get((message_type, None))
+        or _handle_unknown
+    )
+    await handler(websocket, message, broker)
+
+
+# Canned mock responses; built once at import so generate_agent_response
+# does no string assembly per call.
+_SIMULATION_RESPONSE = (
+    "I can help you run attack simulations! Here are some options:\n\n"
+    "- **Lateral Movement**: Simulate attacker movement between systems\n"
+    "- **Privilege Escalation**: Test elevation of privileges\n"
+    "- **Data Exfiltration**: Analyze data theft scenarios\n"
+    "- **Persistence**: Evaluate long-term access methods\n\n"
+    "To start a simulation, try: 'Run a lateral movement simulation'"
+)
+
+_GRAPH_RESPONSE = (
+    "I can analyze your network topology! To get started:\n\n"
+    "1. **Upload a graph**: Use the 'Upload Graph JSON' button\n"
+    "2. **Load sample data**: Click 'Load Sample Graph' for a demo\n"
+    "3. **Run queries**: Use the Cypher panel to explore your data\n\n"
+    "Try loading the sample graph to see a network visualization."
+)
+
+_CYPHER_RESPONSE = (
+    "You can use Cypher queries to explore your graph data:\n\n"
+    "**Common queries:**\n"
+    "```\n"
+    "MATCH (n) RETURN n LIMIT 10\n"
+    "MATCH (n)-[r]->(m) RETURN n, r, m LIMIT 5\n"
+    "```\n\n"
+    "The query results will appear below the Cypher panel."
+)
+
+_HELP_RESPONSE = (
+    "Welcome to the **Graph Scenario Workbench**!\n\n"
+    "**What I can help with:**\n"
+    "- **Graph analysis** - upload and visualize network topologies\n"
+    "- **Attack simulations** - run cybersecurity scenarios\n"
+    "- **Cypher queries** - explore graph data with Neo4j queries\n"
+    "- **Real-time monitoring** - track simulation progress\n\n"
+    "**Quick start:** Try 'Load sample graph' to see the visualization!"
+)
+
+_FALLBACK_RESPONSE = (
+    "I understand you're asking about: *{user_message}*\n\n"
+    "I'm a cybersecurity agent focused on graph analysis and attack simulations. "
+    "For best results, try queries about:\n"
+    "- Network topology analysis\n"
+    "- Attack scenario planning\n"
+    "- Graph data exploration\n\n"
+    "Type 'help' for more information!"
+)
+
+# One compiled alternation scans the message a single time; the matched
+# group name selects the response.
+_KEYWORD_PATTERN = re.compile(
+    r"\b(?P<sim>simulation|attack|scenario)\b"
+    r"|\b(?P<graph>graph|topology|network)\b"
+    r"|\b(?P<cypher>cypher|query|search)\b"
+    r"|\b(?P<help>help|how|what)\b|(?P<help_mark>\?)",
+    re.IGNORECASE,
+)
+
+_RESPONSE_BY_GROUP = {
+    "sim": _SIMULATION_RESPONSE,
+    "graph": _GRAPH_RESPONSE,
+    "cypher": _CYPHER_RESPONSE,
+    "help": _HELP_RESPONSE,
+    "help_mark": _HELP_RESPONSE,
+}
+
+
+async def generate_agent_response(user_message: str) -> str:
+    """Generate a mock agent response based on user input."""
+    match = _KEYWORD_PATTERN.search(user_message)
+    if match:
+        return _RESPONSE_BY_GROUP[match.lastgroup]
+    return _FALLBACK_RESPONSE.format(user_message=user_message)
+
+
+@router.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket):
+    logger.info("WebSocket endpoint hit")
+
+    broker = get_broker()
+    connection = None
+
+    try:
+        logger.info("Accepting WebSocket connection...")
+        await websocket.accept()
+        logger.info("WebSocket accepted, registering with broker...")
+        connection = await broker.register(websocket)
+        websocket.state.connection = connection
+        websocket.state.connection_id = connection.id
+        if not getattr(websocket.state, 'thread_id', None):
+            websocket.state.thread_id = connection.id
+
+        # Agent app is already initialized in app.state by lifespan
+        logger.info("WebSocket connected - agent app available from app.state")
+
+        logger.info("Entering WebSocket message loop")
+        # iter_text handles the disconnect sentinel internally; the iterator
+        # just ends when the client goes away.
+        async for data in websocket.iter_text():
+            logger.debug("ws recv %d bytes", len(data))
+
+            if len(data) > MAX_WS_MSG_BYTES:
+                logger.warning("Dropping oversized websocket message (%d bytes)", len(data))
+                # Bypass the outbox: breaking out of the loop unregisters the
+                # connection and cancels the writer before a queued frame
+                # would ever be sent. Write directly, then close with 1009
+                # ("message too big") so the client sees a clean rejection.
+                try:
+                    await websocket.send_text(_encode(_error_payload(
+                        WebSocketErrorType.MESSAGE_VALIDATION,
+                        f"Message exceeds {MAX_WS_MSG_BYTES} byte limit",
+                        recoverable=False,
+                    )))
+                    await websocket.close(code=1009, reason="Message too big")
+                except Exception as e:
+                    logger.error("Failed to reject oversized message: %s", e)
+                break
+
+            # Parse and handle agent messages
+            try:
+                message = json.loads(data)
+                await handle_agent_message(websocket, message, broker)
+            except json.JSONDecodeError as e:
+                logger.error("JSON decode error: %s", e)
+                await send_error_message(
+                    websocket,
+                    WebSocketErrorType.JSON_DECODE,
+                    "Invalid JSON format in message",
+                    recoverable=True
+                )
+            except Exception as e:
+                logger.warning("WebSocket error handling message: %s: %s", type(e).__name__, e)
+                # Send structured error with reconnection hint
+                await send_error_message(
+                    websocket,
+                    WebSocketErrorType.INTERNAL_ERROR,
+                    f"Internal server error: {str(e)}",
+                    recoverable=True,
+                    retry_after_ms=5000  # Suggest reconnect after 5 seconds
+                )
+                break
+        logger.info("WebSocket client disconnected normally")
+
+    except Exception as e:
+        logger.error("WebSocket connection error: %s", e, exc_info=True)
+        try:
+            await websocket.close(code=1011, reason="Internal server error")
+        except:
+            pass
+    finally:
+        if connection:
+            try:
+                await broker.unregister(connection)
+            except Exception as e:
+                logger.error("Error unregistering WebSocket connection: %s", e)
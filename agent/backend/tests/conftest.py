@@ -1,38 +1,179 @@
-"""
-Pytest configuration and fixtures for backend tests.
-"""
-import pytest
-import asyncio
-from unittest.mock import patch
-
-
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
-@pytest.fixture
-def mock_env_vars():
-    """Mock environment variables for testing."""
-    env_vars = {
-        "GRAPH_NEO4J_URI": "bolt://localhost:7687",
-        "GRAPH_NEO4J_USER": "neo4j",
-        "GRAPH_NEO4J_PASSWORD": "testpass",
-        "GRAPH_NEO4J_DATABASE": "neo4j",
-        "OPENAI_API_KEY": "test-key",
-        "OPENAI_MODEL": "gpt-4o-mini"
-    }
-
-    with patch.dict("os.environ", env_vars):
-        yield env_vars
-
-
-@pytest.fixture
-def disable_mcp_initialization():
-    """Disable actual MCP initialization for unit tests."""
-    with patch('agent.mcp_integration.MCPToolkit') as mock_toolkit:
-        mock_toolkit.return_value = None
-        yield mock_toolkit
\ No newline at end of file
+"""
+Pytest configuration and fixtures for backend tests.
+
+The app is built once per process (cached_app) and shared across every
+test module; tests must not mutate app state directly — vary behaviour
+through the mock fixtures below instead.
+"""
+import pytest
+import pytest_asyncio
+from functools import lru_cache
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from pydantic import TypeAdapter
+
+from agent.backend.app.api import CypherRequest, CypherResult, GraphPayload, build_app
+from agent.simulation_engine import SimulationPlatform
+
+
+@pytest.fixture
+def mock_env_vars():
+    """Mock environment variables for testing."""
+    env_vars = {
+        "GRAPH_NEO4J_URI": "bolt://localhost:7687",
+        "GRAPH_NEO4J_USER": "neo4j",
+        "GRAPH_NEO4J_PASSWORD": "testpass",
+        "GRAPH_NEO4J_DATABASE": "neo4j",
+        "OPENAI_API_KEY": "test-key",
+        "OPENAI_MODEL": "gpt-4o-mini"
+    }
+
+    with patch.dict("os.environ", env_vars):
+        yield env_vars
+
+
+@lru_cache(maxsize=1)
+def cached_app():
+    """Build the FastAPI app once per process.
+
+    Session-scoped fixtures are per pytest-xdist worker; the lru_cache also
+    covers fixtures and modules that call this directly.
+    """
+    application = build_app()
+    # Pydantic builds validators lazily on first use; warm them here so the
+    # first test hitting each route pays only the fast validation path.
+    for model in (GraphPayload, CypherRequest, CypherResult):
+        model.model_rebuild(force=True)
+        TypeAdapter(model)
+    return application
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The process-wide app instance; the tests only vary mocks around it."""
+    return cached_app()
+
+
+@pytest_asyncio.fixture
+async def client(app):
+    """Async client driving the ASGI app in-process.
+
+    raise_app_exceptions=False lets the app's exception handlers produce
+    their responses instead of the transport re-raising into the test.
+    """
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+        yield async_client
+
+
+class StubRegistry:
+    """Minimal ToolRegistry stand-in exposing only what the API awaits.
+
+    AsyncMock attribute chains allocate child mocks and record history on
+    every access; the endpoints only need the ops object back.
+    """
+
+    def __init__(self):
+        self.ops = AsyncMock()
+        self._client = object()
+
+    async def get_mcp_client(self):
+        return self._client
+
+    async def get_mcp_operations(self):
+        return self.ops
+
+
+@pytest.fixture
+def mock_tool_registry():
+    """Create a stub tool registry."""
+    return StubRegistry()
+
+
+@pytest.fixture
+def mock_ops(monkeypatch):
+    """Patch get_mcp_operations once and hand back the operations mock.
+
+    Tests set return values on the mock instead of opening their own
+    with-patch blocks around every request.
+    """
+    ops = AsyncMock()
+    monkeypatch.setattr(
+        "agent.backend.app.api.get_mcp_operations", AsyncMock(return_value=ops)
+    )
+    return ops
+
+
+@pytest.fixture(autouse=True)
+def _patched_registry(monkeypatch, mock_tool_registry):
+    # Install the stub registry once per test instead of stacking
+    # @patch decorators on every endpoint test; tests that need a
+    # different registry monkeypatch over this.
+    monkeypatch.setattr(
+        'agent.backend.app.api.get_tool_registry', lambda: mock_tool_registry
+    )
+    return mock_tool_registry
+
+
+class DummyStatus:
+    def __init__(self, value: str):
+        self.value = value
+
+
+class DummyEvent:
+    def __init__(self, description: str):
+        self.description = description
+
+
+class DummyJob:
+    def __init__(self, job_id: str, *, status: str = "initializing", progress: float = 0.0,
+                 findings: dict | None = None, platform_context: dict | None = None,
+                 events: list | None = None):
+        self.job_id = job_id
+        self.status = DummyStatus(status)
+        self.progress_percentage = progress
+        self.findings = findings or {}
+        self.platform_context = platform_context or {}
+        self.events = events or []
+
+
+class DummyEngine:
+    def __init__(self):
+        self.jobs: dict[str, DummyJob] = {}
+        self.started_scenarios = []
+        self.platform_adapters: dict = {}
+
+    async def start_simulation(self, scenario):
+        job_id = f"job-{len(self.jobs) + 1:03d}"
+        job = DummyJob(job_id)
+        self.jobs[job_id] = job
+        self.started_scenarios.append(scenario)
+        return job
+
+    async def get_job_status(self, job_id: str):
+        return self.jobs.get(job_id)
+
+
+@pytest.fixture(scope="module")
+def mock_simulation_engine():
+    # Patch once per module and reset state between tests instead of
+    # rebuilding the engine and re-installing the patch per test.
+    engine = DummyEngine()
+    engine.platform_adapters = {
+        SimulationPlatform.MOCK: object(),
+        SimulationPlatform.CALDERA: object(),
+    }
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr('agent.backend.app.api.get_simulation_engine', lambda: engine)
+        yield engine
+
+
+@pytest.fixture(autouse=True)
+def _reset_engine_state(request):
+    yield
+    if "mock_simulation_engine" in request.fixturenames:
+        engine = request.getfixturevalue("mock_simulation_engine")
+        engine.jobs.clear()
+        engine.started_scenarios.clear()
@@ -1,420 +1,341 @@
-"""
-Integration tests for the updated FastAPI backend with MCP integration.
-"""
-import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import AsyncMock, patch, MagicMock
-
-from agent.backend.app.api import build_app
-from agent.simulation_engine import SimulationPlatform
-
-@pytest.fixture
-def app():
-    """Create FastAPI app for testing."""
-    return build_app()
-
-
-@pytest.fixture
-def client(app):
-    """Create test client with mocked dependencies."""
-    return TestClient(app)
-
-
-@pytest.fixture
-def mock_tool_registry():
-    """Create mock tool registry."""
-    registry = AsyncMock()
-    registry.get_mcp_client.return_value = AsyncMock()
-    registry.get_mcp_operations.return_value = AsyncMock()
-    return registry
-
-
-
-
-class DummyStatus:
-    def __init__(self, value: str):
-        self.value = value
-
-
-class DummyEvent:
-    def __init__(self, description: str):
-        self.description = description
-
-
-class DummyJob:
-    def __init__(self, job_id: str, *, status: str = "initializing", progress: float = 0.0,
-                 findings: dict | None = None, platform_context: dict | None = None,
-                 events: list | None = None):
-        self.job_id = job_id
-        self.status = DummyStatus(status)
-        self.progress_percentage = progress
-        self.findings = findings or {}
-        self.platform_context = platform_context or {}
-        self.events = events or []
-
-
-class DummyEngine:
-    def __init__(self):
-        self.jobs: dict[str, DummyJob] = {}
-        self.started_scenarios = []
-        self.platform_adapters: dict = {}
-
-    async def start_simulation(self, scenario):
-        job_id = f"job-{len(self.jobs) + 1:03d}"
-        job = DummyJob(job_id)
-        self.jobs[job_id] = job
-        self.started_scenarios.append(scenario)
-        return job
-
-    async def get_job_status(self, job_id: str):
-        return self.jobs.get(job_id)
-
-
-@pytest.fixture
-def mock_simulation_engine(monkeypatch):
-    engine = DummyEngine()
-    engine.platform_adapters = {
-        SimulationPlatform.MOCK: object(),
-        SimulationPlatform.CALDERA: object(),
-    }
-    monkeypatch.setattr('agent.backend.app.api.get_simulation_engine', lambda: engine)
-    return engine
-
-
-class TestHealthEndpoint:
-    """Test health endpoint functionality."""
-
-    def test_health_endpoint_success(self, client):
-        """Test health endpoint returns correct status."""
-        response = client.get("/api/health")
-        assert response.status_code == 200
-
-        data = response.json()
-        assert data["status"] == "ok"
-        assert data["architecture"] == "mcp"
-        assert "details" in data
-        assert data["details"]["mcp_enabled"] is True
-
-
-class TestGraphOperations:
-    """Test graph operation endpoints."""
-
-    @patch('agent.backend.app.api.get_tool_registry')
-    def test_load_graph_success(self, mock_get_registry, client, mock_tool_registry):
-        """Test successful graph loading."""
-        # Setup mock
-        mock_get_registry.return_value = mock_tool_registry
-        mock_mcp_ops = mock_tool_registry.get_mcp_operations.return_value
-        mock_mcp_ops.load_graph.return_value = {
-            "nodes_created": 2,
-            "edges_created": 1,
-            "errors": []
-        }
-
-        payload = {
-            "nodes": [
-                {"id": "n1", "labels": ["Host"], "attrs": {"ip": "10.0.0.1"}},
-                {"id": "n2", "labels": ["Host"], "attrs": {"ip": "10.0.0.2"}},
-            ],
-            "edges": [
-                {
-                    "source": "n1",
-                    "target": "n2",
-                    "type": "allowed_tcp",
-                    "attrs": {"port": 445},
-                }
-            ],
-        }
-
-        response = client.post("/tools/load_graph", json=payload)
-        assert response.status_code == 200
-
-        data = response.json()
-        assert data["status"] == "success"
-        assert data["nodes_created"] == 2
-        assert data["edges_created"] == 1
-        assert len(data["errors"]) == 0
-        assert data["summary"]["nodes"] == 2
-        assert data["summary"]["edges"] == 1
-        # Should include original payload for frontend
-        assert "nodes" in data
-        assert "edges" in data
-
-    def test_load_graph_validation_error(self, client):
-        """Test graph loading with invalid payload."""
-        # Missing required 'id' field in node
-        payload = {
-            "nodes": [
-                {"labels": ["Host"], "attrs": {"ip": "10.0.0.1"}},  # Missing 'id'
-            ],
-            "edges": [],
-        }
-
-        response = client.post("/tools/load_graph", json=payload)
-        assert response.status_code == 400
-
-        data = response.json()
-        assert "error" in data
-        assert data["error"]["type"] == "validation_error"
-        assert "id" in data["error"]["message"]
-
-    @patch('agent.backend.app.api.get_tool_registry')
-    def test_load_graph_with_errors(self, mock_get_registry, client, mock_tool_registry):
-        """Test graph loading with partial failures."""
-        mock_get_registry.return_value = mock_tool_registry
-        mock_mcp_ops = mock_tool_registry.get_mcp_operations.return_value
-        mock_mcp_ops.load_graph.return_value = {
-            "nodes_created": 1,
-            "edges_created": 0,
-            "errors": ["Failed to create node n2: Invalid data"]
-        }
-
-        payload = {
-            "nodes": [{"id": "n1", "labels": ["Host"], "attrs": {"ip": "10.0.0.1"}}],
-            "edges": []
-        }
-
-        response = client.post("/tools/load_graph", json=payload)
-        assert response.status_code == 200
-
-        data = response.json()
-        assert data["nodes_created"] == 1
-        assert data["summary"]["nodes"] == 1
-        assert data["summary"]["edges"] == 0
-        assert len(data["errors"]) == 1
-
-
-class TestCypherOperations:
-    """Test Cypher query endpoint."""
-
-    @patch('agent.backend.app.api.get_tool_registry')
-    def test_run_cypher_success(self, mock_get_registry, client, mock_tool_registry):
-        """Test successful Cypher query execution."""
-        mock_get_registry.return_value = mock_tool_registry
-        mock_mcp_ops = mock_tool_registry.get_mcp_operations.return_value
-        mock_mcp_ops.run_cypher.return_value = {
-            "records": [{"n.id": "node1", "n.name": "Test Node"}],
-            "summary": {"nodes_returned": 1}
-        }
-
-        payload = {
-            "query": "MATCH (n) RETURN n.id, n.name LIMIT 1",
-            "mode": "read"
-        }
-
-        response = client.post("/tools/run_cypher", json=payload)
-        assert response.status_code == 200
-
-        data = response.json()
-        assert data == mock_mcp_ops.run_cypher.return_value
-        mock_mcp_ops.run_cypher.assert_awaited_once_with(
-            query="MATCH (n) RETURN n.id, n.name LIMIT 1",
-            params={},
-            mode="read"
-        )
-
-    def test_run_cypher_empty_query(self, client):
-        """Test Cypher query with empty query string."""
-        payload = {
-            "query": "",  # Empty query
-            "mode": "read"
-        }
-
-        response = client.post("/tools/run_cypher", json=payload)
-        assert response.status_code == 400
-
-        data = response.json()
-        assert "error" in data
-        assert data["error"]["type"] == "validation_error"
-
-    def test_run_cypher_whitespace_only(self, client):
-        """Test Cypher query with whitespace-only query."""
-        payload = {
-            "query": "   \n\t   ",  # Whitespace only
-            "mode": "read"
-        }
-
-        response = client.post("/tools/run_cypher", json=payload)
-        assert response.status_code == 400
-
-    @patch('agent.backend.app.api.get_settings')
-    @patch('agent.backend.app.api.get_tool_registry')
-    def test_run_cypher_write_mode(self, mock_get_registry, mock_get_settings, client, mock_tool_registry):
-        """Test Cypher query in write mode when enabled."""
-        mock_get_registry.return_value = mock_tool_registry
-        mock_get_settings.return_value = Settings(allow_write_cypher=True)
-        mock_mcp_ops = mock_tool_registry.get_mcp_operations.return_value
-        mock_mcp_ops.run_cypher.return_value = {
-            "records": [],
-            "summary": {"nodes_created": 1}
-        }
-
-        payload = {
-            "query": "CREATE (n:Test {name: 'test'}) RETURN n",
-            "mode": "write",
-            "params": {"name": "test"}
-        }
-
-        response = client.post("/tools/run_cypher", json=payload)
-        assert response.status_code == 200
-
-        mock_mcp_ops.run_cypher.assert_awaited_once_with(
-            query=payload["query"],
-            params={"name": "test"},
-            mode="write"
-        )
-
-
-class TestSimulationEndpoints:
-    """Test attack simulation endpoints."""
-
-    def test_start_attack_success(self, client, mock_simulation_engine):
-        """Test starting attack simulation."""
-        payload = {
-            "platform": "mock",
-            "scenarioId": "lateral_movement"
-        }
-
-        response = client.post("/tools/start_attack", json=payload)
-        assert response.status_code == 200
-
-        data = response.json()
-        assert data["jobId"].startswith("job-")
-        assert data["status"] == "pending"
-        assert data["platform"] == "mock"
-        assert data["scenarioId"] == "lateral_movement"
-        assert mock_simulation_engine.started_scenarios
-
-    def test_start_attack_caldera_merges_params(self, client, mock_simulation_engine):
-        payload = {
-            "platform": "caldera",
-            "scenarioId": "lateral_movement",
-            "params": {
-                "caldera": {
-                    "operation": {
-                        "planner": "batch",
-                        "visibility": 80
-                    }
-                },
-                "stealth_level": "high"
-            }
-        }
-
-        response = client.post("/tools/start_attack", json=payload)
-        assert response.status_code == 200
-        data = response.json()
-        assert data["platform"] == "caldera"
-
-        scenario = mock_simulation_engine.started_scenarios[-1]
-        caldera_params = scenario.parameters.get("caldera", {})
-        operation_cfg = caldera_params.get("operation", {})
-        assert operation_cfg.get("planner") == "batch"
-        assert operation_cfg.get("autonomous") == 1
-        assert scenario.parameters.get("stealth_level") == "high"
-
-    def test_start_attack_invalid_payload(self, client):
-        """Test starting attack with invalid payload."""
-        response = client.post("/tools/start_attack", json="invalid")
-        assert response.status_code == 400
-        assert "detail" in response.json()
-
-    def test_start_attack_missing_scenario(self, client):
-        """Scenario ID is required."""
-        response = client.post("/tools/start_attack", json={"platform": "mock"})
-        assert response.status_code == 400
-
-    def test_check_attack_status(self, client, mock_simulation_engine):
-        """Test checking attack status."""
-        mock_simulation_engine.jobs["sim-test123"] = DummyJob(
-            job_id="sim-test123",
-            status="running",
-            progress=42.5,
-            events=[DummyEvent("Running step 1")],
-        )
-
-        response = client.post("/tools/check_attack", json={"job_id": "sim-test123"})
-        assert response.status_code == 200
-
-        data = response.json()
-        assert data["jobId"] == "sim-test123"
-        assert data["status"] == "running"
-        assert data["progress"] == pytest.approx(42.5)
-        assert data["details"] == "Running step 1"
-
-    def test_check_attack_missing_job_id(self, client):
-        """Test checking attack status without job ID."""
-        response = client.post("/tools/check_attack", json={})
-        assert response.status_code == 400
-
-    def test_fetch_results_success(self, client, mock_simulation_engine):
-        """Test fetching attack results."""
-        mock_simulation_engine.jobs["sim-test123"] = DummyJob(
-            job_id="sim-test123",
-            status="completed",
-            progress=100.0,
-            findings={"summary": {"scenario_name": "Test Scenario", "summary": "Completed"}},
-            platform_context={"caldera": {"operation_id": "op-123"}},
-        )
-
-        response = client.post("/tools/fetch_results", json={"job_id": "sim-test123"})
-        assert response.status_code == 200
-
-        data = response.json()
-        assert data["jobId"] == "sim-test123"
-        assert data["status"] == "succeeded"
-        assert isinstance(data["findings"], dict)
-        assert data["platformContext"]["caldera"]["operation_id"] == "op-123"
-        assert data["details"] == "Completed"
-
-    def test_fetch_results_unknown_job(self, client, mock_simulation_engine):
-        """Test fetching results for unknown job."""
-        response = client.post("/tools/fetch_results", json={"job_id": "unknown-job"})
-        assert response.status_code == 200
-
-        data = response.json()
-        assert data["jobId"] == "unknown-job"
-        assert data["status"] == "unknown"
-        assert data["findings"] == {}
-        assert data["platformContext"] == {}
-
-
-class TestErrorHandling:
-    """Test error handling across endpoints."""
-
-    @patch('agent.backend.app.api.get_tool_registry')
-    def test_mcp_connection_error(self, mock_get_registry, client):
-        """Test handling of MCP connection errors."""
-        # Mock registry that raises connection error
-        mock_registry = AsyncMock()
-        mock_registry.get_mcp_client.side_effect = Exception("Connection failed")
-        mock_get_registry.return_value = mock_registry
-
-        payload = {
-            "nodes": [{"id": "n1", "labels": ["Host"], "attrs": {"ip": "10.0.0.1"}}],
-            "edges": []
-        }
-
-        response = client.post("/tools/load_graph", json=payload)
-        assert response.status_code == 500
-
-        data = response.json()
-        assert "error" in data
-        assert "Failed to load graph" in data["error"]["message"]
-
-    def test_invalid_json_payload(self, client):
-        """Test handling of invalid JSON in request."""
-        response = client.post(
-            "/tools/load_graph",
-            data="invalid json",
-            headers={"Content-Type": "application/json"}
-        )
-        assert response.status_code == 422  # Unprocessable Entity from FastAPI
-
-    def test_missing_required_fields(self, client):
-        """Test handling of missing required fields in Pydantic models."""
-        # Send payload without required 'nodes' and 'edges' fields
-        response = client.post("/tools/load_graph", json={})
-
-        # FastAPI should handle this with Pydantic validation
-        assert response.status_code == 422
-
+"""
+Integration tests for the updated FastAPI backend with MCP integration.
+"""
+import asyncio
+from types import MappingProxyType
+
+import orjson
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from agent.backend.app.settings import Settings
+
+from conftest import DummyEvent, DummyJob
+
+pytestmark = pytest.mark.asyncio
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Static request bodies serialized once at import; posting content= skips
+# the per-call json.dumps inside httpx.
+_LOAD_GRAPH_OK_BODY = orjson.dumps({
+    "nodes": [
+        {"id": "n1", "labels": ["Host"], "attrs": {"ip": "10.0.0.1"}},
+        {"id": "n2", "labels": ["Host"], "attrs": {"ip": "10.0.0.2"}},
+    ],
+    "edges": [
+        {
+            "source": "n1",
+            "target": "n2",
+            "type": "allowed_tcp",
+            "attrs": {"port": 445},
+        }
+    ],
+})
+
+_LOAD_GRAPH_PARTIAL_BODY = orjson.dumps({
+    "nodes": [{"id": "n1", "labels": ["Host"], "attrs": {"ip": "10.0.0.1"}}],
+    "edges": []
+})
+
+_LOAD_GRAPH_MISSING_ID_BODY = orjson.dumps({
+    "nodes": [{"labels": ["Host"], "attrs": {"ip": "10.0.0.1"}}],  # Missing 'id'
+    "edges": []
+})
+
+_CYPHER_READ_QUERY = "MATCH (n) RETURN n.id, n.name LIMIT 1"
+_CYPHER_READ_BODY = orjson.dumps({"query": _CYPHER_READ_QUERY, "mode": "read"})
+
+# Frozen views: shared across parametrized runs and xdist workers, so make
+# accidental mutation impossible; call sites pass dict(...) where the HTTP
+# client needs a serializable mapping.
+_CYPHER_EMPTY_PAYLOAD = MappingProxyType({"query": "", "mode": "read"})
+_CYPHER_WHITESPACE_PAYLOAD = MappingProxyType({"query": "   \n\t   ", "mode": "read"})
+_CYPHER_WRITE_PAYLOAD = MappingProxyType({
+    "query": "CREATE (n:Test {name: 'test'}) RETURN n",
+    "mode": "write",
+    "params": {"name": "test"}
+})
+
+_START_ATTACK_MOCK_PAYLOAD = MappingProxyType({
+    "platform": "mock",
+    "scenarioId": "lateral_movement"
+})
+_START_ATTACK_CALDERA_PAYLOAD = MappingProxyType({
+    "platform": "caldera",
+    "scenarioId": "lateral_movement",
+    "params": {
+        "caldera": {
+            "operation": {
+                "planner": "batch",
+                "visibility": 80
+            }
+        },
+        "stealth_level": "high"
+    }
+})
+
+
+def _json(response):
+    # orjson decode of the raw body; response.json() routes through stdlib json.
+    return orjson.loads(response.content)
+
+
+class TestHealthEndpoint:
+    """Test health endpoint functionality."""
+
+    async def test_health_endpoint_success(self, client):
+        """Test health endpoint returns correct status."""
+        response = await client.get("/api/health")
+        assert response.status_code == 200
+
+        data = _json(response)
+        assert data["status"] == "ok"
+        assert data["architecture"] == "mcp"
+        assert "details" in data
+        assert data["details"]["mcp_enabled"] is True
+
+
+class TestGraphOperations:
+    """Test graph operation endpoints."""
+
+    @pytest.mark.parametrize(
+        "body, load_graph_return, expected_status",
+        [
+            pytest.param(
+                _LOAD_GRAPH_OK_BODY,
+                {"nodes_created": 2, "edges_created": 1, "errors": []},
+                200,
+                id="success",
+            ),
+            pytest.param(
+                _LOAD_GRAPH_PARTIAL_BODY,
+                {"nodes_created": 1, "edges_created": 0,
+                 "errors": ["Failed to create node n2: Invalid data"]},
+                200,
+                id="partial-errors",
+            ),
+            pytest.param(_LOAD_GRAPH_MISSING_ID_BODY, None, 400, id="validation-error"),
+        ],
+    )
+    async def test_load_graph(self, body, load_graph_return,
+                              expected_status, client, mock_tool_registry):
+        """Load-graph happy path, partial failures, and payload validation."""
+        if load_graph_return is not None:
+            mock_tool_registry.ops.load_graph.return_value = load_graph_return
+
+        response = await client.post(
+            "/tools/load_graph", content=body, headers=_JSON_HEADERS
+        )
+        assert response.status_code == expected_status
+        data = _json(response)
+
+        if expected_status == 200:
+            assert data["status"] == "success"
+            assert data["nodes_created"] == load_graph_return["nodes_created"]
+            assert data["edges_created"] == load_graph_return["edges_created"]
+            assert len(data["errors"]) == len(load_graph_return["errors"])
+            assert data["summary"]["nodes"] == load_graph_return["nodes_created"]
+            assert data["summary"]["edges"] == load_graph_return["edges_created"]
+            # Should include original payload for frontend
+            assert "nodes" in data
+            assert "edges" in data
+        else:
+            assert "error" in data
+            assert data["error"]["type"] == "validation_error"
+            assert "id" in data["error"]["message"]
+
+
+class TestCypherOperations:
+    """Test Cypher query endpoint."""
+
+    async def test_run_cypher_success(self, client, mock_tool_registry):
+        """Test successful Cypher query execution."""
+        mock_mcp_ops = mock_tool_registry.ops
+        mock_mcp_ops.run_cypher.return_value = {
+            "records": [{"n.id": "node1", "n.name": "Test Node"}],
+            "summary": {"nodes_returned": 1}
+        }
+
+        response = await client.post(
+            "/tools/run_cypher", content=_CYPHER_READ_BODY, headers=_JSON_HEADERS
+        )
+        assert response.status_code == 200
+
+        data = _json(response)
+        assert data == mock_mcp_ops.run_cypher.return_value
+        mock_mcp_ops.run_cypher.assert_awaited_once_with(
+            query=_CYPHER_READ_QUERY,
+            params={},
+            mode="read"
+        )
+
+    async def test_run_cypher_empty_query(self, client):
+        """Test Cypher query with empty query string."""
+        response = await client.post("/tools/run_cypher", json=dict(_CYPHER_EMPTY_PAYLOAD))
+        assert response.status_code == 400
+
+        data = _json(response)
+        assert "error" in data
+        assert data["error"]["type"] == "validation_error"
+
+    async def test_run_cypher_whitespace_only(self, client):
+        """Test Cypher query with whitespace-only query."""
+        response = await client.post("/tools/run_cypher", json=dict(_CYPHER_WHITESPACE_PAYLOAD))
+        assert response.status_code == 400
+
+    @patch('agent.backend.app.api.get_settings')
+    async def test_run_cypher_write_mode(self, mock_get_settings, client, mock_tool_registry):
+        """Test Cypher query in write mode when enabled."""
+        mock_get_settings.return_value = Settings(allow_write_cypher=True)
+        mock_mcp_ops = mock_tool_registry.ops
+        mock_mcp_ops.run_cypher.return_value = {
+            "records": [],
+            "summary": {"nodes_created": 1}
+        }
+
+        response = await client.post("/tools/run_cypher", json=dict(_CYPHER_WRITE_PAYLOAD))
+        assert response.status_code == 200
+
+        mock_mcp_ops.run_cypher.assert_awaited_once_with(
+            query=_CYPHER_WRITE_PAYLOAD["query"],
+            params={"name": "test"},
+            mode="write"
+        )
+
+
+class TestSimulationEndpoints:
+    """Test attack simulation endpoints."""
+
+    async def test_start_attack_success(self, client, mock_simulation_engine):
+        """Test starting attack simulation."""
+        response = await client.post("/tools/start_attack", json=dict(_START_ATTACK_MOCK_PAYLOAD))
+        assert response.status_code == 200
+
+        data = _json(response)
+        assert data["jobId"].startswith("job-")
+        assert data["status"] == "pending"
+        assert data["platform"] == "mock"
+        assert data["scenarioId"] == "lateral_movement_generic"
+        assert mock_simulation_engine.started_scenarios
+
+    async def test_start_attack_caldera_merges_params(self, client, mock_simulation_engine):
+        response = await client.post("/tools/start_attack", json=dict(_START_ATTACK_CALDERA_PAYLOAD))
+        assert response.status_code == 200
+        data = _json(response)
+        assert data["platform"] == "caldera"
+
+        scenario = mock_simulation_engine.started_scenarios[-1]
+        caldera_params = scenario.parameters.get("caldera", {})
+        operation_cfg = caldera_params.get("operation", {})
+        assert operation_cfg.get("planner") == "batch"
+        assert operation_cfg.get("autonomous") == 1
+        assert scenario.parameters.get("stealth_level") == "high"
+
+    async def test_start_attack_invalid_payload(self, client):
+        """Test starting attack with invalid payload."""
+        response = await client.post("/tools/start_attack", json="invalid")
+        # Pydantic rejects the non-dict body before the endpoint runs
+        assert response.status_code == 422
+        data = _json(response)
+        assert "detail" in data
+
+    async def test_start_attack_missing_scenario(self, client):
+        """Scenario ID is required."""
+        response = await client.post("/tools/start_attack", json={"platform": "mock"})
+        assert response.status_code == 400
+
+    async def test_simulation_status_flow(self, client, mock_simulation_engine):
+        """Check-status and fetch-results round-trips, issued concurrently.
+
+        The handlers are async and independent, so the four calls can share
+        one gather instead of four serial request/assert cycles.
+        """
+        mock_simulation_engine.jobs["sim-running"] = DummyJob(
+            job_id="sim-running",
+            status="running",
+            progress=42.5,
+            events=[DummyEvent("Running step 1")],
+        )
+        mock_simulation_engine.jobs["sim-done"] = DummyJob(
+            job_id="sim-done",
+            status="completed",
+            progress=100.0,
+            findings={"summary": {"scenario_name": "Test Scenario", "summary": "Completed"}},
+            platform_context={"caldera": {"operation_id": "op-123"}},
+        )
+
+        check_running, check_missing_id, fetch_done, fetch_unknown = await asyncio.gather(
+            client.post("/tools/check_attack", json={"job_id": "sim-running"}),
+            client.post("/tools/check_attack", json={}),
+            client.post("/tools/fetch_results", json={"job_id": "sim-done"}),
+            client.post("/tools/fetch_results", json={"job_id": "unknown-job"}),
+        )
+
+        assert check_running.status_code == 200
+        data = _json(check_running)
+        assert data["jobId"] == "sim-running"
+        assert data["status"] == "running"
+        # The value flows through unchanged — no float math, so exact equality
+        assert data["progress"] == 42.5
+        assert data["details"] == "Running step 1"
+
+        # job_id is required
+        assert check_missing_id.status_code == 400
+
+        assert fetch_done.status_code == 200
+        data = _json(fetch_done)
+        assert data["jobId"] == "sim-done"
+        assert data["status"] == "succeeded"
+        assert data["findings"]["summary"]["scenario_name"] == "Test Scenario"
+        assert data["platformContext"]["caldera"]["operation_id"] == "op-123"
+        assert data["details"] == "Completed"
+
+        assert fetch_unknown.status_code == 200
+        data = _json(fetch_unknown)
+        assert data["jobId"] == "unknown-job"
+        assert data["status"] == "unknown"
+        assert data["findings"] == {}
+        assert data["platformContext"] == {}
+
+
+class TestErrorHandling:
+    """Test error handling across endpoints."""
+
+    async def test_mcp_connection_error(self, monkeypatch, client):
+        """Test handling of MCP connection errors."""
+        # Registry that raises a connection error, overriding the autouse stub
+        mock_registry = AsyncMock()
+        mock_registry.get_mcp_operations.side_effect = Exception("Connection failed")
+        monkeypatch.setattr(
+            'agent.backend.app.api.get_tool_registry', lambda: mock_registry
+        )
+
+        response = await client.post(
+            "/tools/load_graph", content=_LOAD_GRAPH_PARTIAL_BODY, headers=_JSON_HEADERS
+        )
+        assert response.status_code == 500
+
+        data = _json(response)
+        assert data["error"]["type"] == "mcp_error"
+        # Deterministic message: exact equality instead of substring scans
+        assert data["error"]["message"] == (
+            "Graph operation 'load_graph' failed: Failed to connect to Neo4j database"
+        )
+
+    async def test_invalid_json_payload(self, client):
+        """Test handling of invalid JSON in request."""
+        response = await client.post(
+            "/tools/load_graph",
+            content="invalid json",
+            headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 422  # Unprocessable Entity from FastAPI
+
+    async def test_missing_required_fields(self, client):
+        """Test handling of invalid field types in Pydantic models."""
+        # 'nodes' must be a list; a string fails FastAPI validation
+        response = await client.post("/tools/load_graph", json={"nodes": "not-a-list"})
+
+        # FastAPI should handle this with Pydantic validation
+        assert response.status_code == 422
@@ -1,84 +1,94 @@
-from unittest.mock import AsyncMock, patch
-
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 
-from agent.backend.app.main import build_app
-
-
-@pytest.fixture()
+from conftest import cached_app
+
+
+def _json(response):
+    # orjson decode of the raw body; response.json() routes through stdlib json.
+    return orjson.loads(response.content)
+
+
+# Static payloads shared across runs; tests treat them as read-only.
+_LOAD_GRAPH_PAYLOAD = {
+    "version": "1.0",
+    "metadata": {"source": "test"},
+    "nodes": [
+        {"id": "n1", "labels": ["Host"], "attrs": {"ip": "10.0.0.1"}},
+        {"id": "n2", "labels": ["Host"], "attrs": {"ip": "10.0.0.2"}},
+    ],
+    "edges": [
+        {
+            "id": "e1",
+            "source": "n1",
+            "target": "n2",
+            "type": "allowed_tcp",
+            "attrs": {"port": 445},
+        }
+    ],
+}
+
+_CYPHER_READ_PAYLOAD = {
+    "query": "MATCH (n) RETURN n",
+    "mode": "read",
+    "params": {"limit": 5}
+}
+
+_CYPHER_WRITE_PAYLOAD = {
+    "query": "CREATE (n {id: 'n1'}) RETURN n",
+    "mode": "write"
+}
+
+_EXPECTED_CYPHER_RESULT = {
+    "records": [{"n": {"id": "n1"}}],
+    "summary": {"nodes": 1}
+}
+
+
+@pytest.fixture(scope="session")
 def client():
-    app = build_app()
-    with TestClient(app) as test_client:
+    # One app + client for the whole session; rebuilding the FastAPI app
+    # (router wiring, pydantic schema builds, lifespan) per test dominates
+    # the runtime of these small smoke tests.
+    with TestClient(cached_app()) as test_client:
         yield test_client
 
 
 def test_health_endpoints(client):
     response = client.get("/api/health")
     assert response.status_code == 200
-    data = response.json()
+    data = _json(response)
     assert data["status"] == "ok"
 
     compat_response = client.get("/tools/health")
     assert compat_response.status_code == 200
-    assert compat_response.json()["status"] == "ok"
-
-
-def test_load_graph_roundtrip(client):
-    payload = {
-        "version": "1.0",
-        "metadata": {"source": "test"},
-        "nodes": [
-            {"id": "n1", "labels": ["Host"], "attrs": {"ip": "10.0.0.1"}},
-            {"id": "n2", "labels": ["Host"], "attrs": {"ip": "10.0.0.2"}},
-        ],
-        "edges": [
-            {
-                "id": "e1",
-                "source": "n1",
-                "target": "n2",
-                "type": "allowed_tcp",
-                "attrs": {"port": 445},
-            }
-        ],
-    }
+    assert _json(compat_response)["status"] == "ok"
 
-    mock_ops = AsyncMock()
-    mock_ops.load_graph = AsyncMock(
-        return_value={"nodes_created": 2, "edges_created": 1, "errors": []}
-    )
 
-    with patch("agent.backend.app.api.get_mcp_operations", new=AsyncMock(return_value=mock_ops)):
-        response = client.post("/tools/load_graph", json=payload)
+def test_load_graph_roundtrip(client, mock_ops):
+    mock_ops.load_graph.return_value = {
+        "nodes_created": 2, "edges_created": 1, "errors": []
+    }
+
+    response = client.post("/tools/load_graph", json=_LOAD_GRAPH_PAYLOAD)
 
     assert response.status_code == 200
-    data = response.json()
+    data = _json(response)
     assert data["summary"]["nodes"] == 2
     assert data["summary"]["edges"] == 1
-    assert data["nodes"] == payload["nodes"]
-    assert data["edges"] == payload["edges"]
+    assert data["nodes"] == _LOAD_GRAPH_PAYLOAD["nodes"]
+    assert data["edges"] == _LOAD_GRAPH_PAYLOAD["edges"]
 
 
-def test_run_cypher_read_mode(client):
-    expected_result = {
-        "records": [{"n": {"id": "n1"}}],
-        "summary": {"nodes": 1}
-    }
-    mock_ops = AsyncMock()
-    mock_ops.run_cypher = AsyncMock(return_value=expected_result)
-
-    payload = {
-        "query": "MATCH (n) RETURN n",
-        "mode": "read",
-        "params": {"limit": 5}
-    }
+def test_run_cypher_read_mode(client, mock_ops):
+    mock_ops.run_cypher.return_value = _EXPECTED_CYPHER_RESULT
 
-    with patch("agent.backend.app.api.get_mcp_operations", new=AsyncMock(return_value=mock_ops)):
-        response = client.post("/tools/run_cypher", json=payload)
+    response = client.post("/tools/run_cypher", json=_CYPHER_READ_PAYLOAD)
 
     assert response.status_code == 200
-    data = response.json()
-    assert data == expected_result
+    data = _json(response)
+    assert data == _EXPECTED_CYPHER_RESULT
     mock_ops.run_cypher.assert_awaited_once_with(
         query="MATCH (n) RETURN n",
         params={"limit": 5},
@@ -86,16 +96,9 @@ def test_run_cypher_read_mode(client):
     )
 
 
-def test_run_cypher_blocks_write_when_disabled(client):
-    payload = {
-        "query": "CREATE (n {id: 'n1'}) RETURN n",
-        "mode": "write"
-    }
-
-    mock_get_ops = AsyncMock()
-
-    with patch("agent.backend.app.api.get_mcp_operations", new=mock_get_ops):
-        response = client.post("/tools/run_cypher", json=payload)
+def test_run_cypher_blocks_write_when_disabled(client, mock_ops):
+    response = client.post("/tools/run_cypher", json=_CYPHER_WRITE_PAYLOAD)
 
     assert response.status_code == 403
-    assert mock_get_ops.await_count == 0
+    # The 403 short-circuits before any operation runs
+    assert mock_ops.run_cypher.await_count == 0
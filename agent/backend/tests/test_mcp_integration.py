@@ -2,94 +2,118 @@
 Tests for MCP integration functionality.
 """
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+import pytest_asyncio
+from unittest.mock import AsyncMock
 
 from agent.mcp_integration import Neo4jMCPClient, MCPGraphOperations
 from agent.backend.app.error_handling import GraphOperationError
 
 
-class TestNeo4jMCPClient:
-    """Test Neo4j MCP client functionality."""
+class _FakeTool:
+    """Stand-in for a LangChain MCP tool with a pre-canned response."""
 
-    @pytest.fixture
-    def mock_toolkit(self):
-        """Create mock MCPToolkit."""
-        mock = AsyncMock()
-        mock.aget_tools.return_value = [
-            MagicMock(name="run-cypher"),
-            MagicMock(name="get-schema")
-        ]
-        return mock
+    def __init__(self, name, result=None):
+        self.name = name
+        self.result = result if result is not None else {}
+        self.calls = []
 
-    @pytest.fixture
-    def client(self):
-        """Create MCP client for testing."""
-        return Neo4jMCPClient()
+    async def ainvoke(self, params):
+        self.calls.append(params)
+        return self.result
+
+
+def _make_client(tools=()):
+    """Create a client that picks up the given fake tools on initialize."""
+    client = Neo4jMCPClient()
+    client._preloaded_tools = tools
+    return client
+
+
+@pytest_asyncio.fixture(scope="module")
+async def initialized_client(_fake_mcp_bootstrap):
+    """One initialized client shared by tests that don't exercise teardown.
+
+    Collapses repeated __aenter__/__aexit__ cycles; tests covering
+    initialization or cleanup still build their own client.
+    """
+    client = _make_client([
+        _FakeTool("read_neo4j_cypher", {"records": [], "summary": {}}),
+        _FakeTool("get_neo4j_schema"),
+    ])
+    async with client:
+        yield client
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _fake_mcp_bootstrap():
+    """Patch the MCP bootstrap once for the whole module.
+
+    Initializing for real would spawn the mcp-neo4j-cypher server; instead
+    each client loads whatever _make_client assigned as its tools.
+    """
+    async def _fake_initialize_mcp(self):
+        self._tools = list(self._preloaded_tools)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Neo4jMCPClient, "_initialize_mcp", _fake_initialize_mcp)
+        yield
+
+
+class TestNeo4jMCPClient:
+    """Test Neo4j MCP client functionality."""
 
     @pytest.mark.asyncio
-    async def test_client_initialization(self, client, mock_toolkit):
+    async def test_client_initialization(self):
         """Test client initializes properly."""
-        with patch("agent.mcp_integration.MCPToolkit", return_value=mock_toolkit):
-            async with client:
-                assert client._initialized is True
-                assert client._toolkit is not None
+        client = _make_client([_FakeTool("read_neo4j_cypher")])
+        async with client:
+            assert client._initialized is True
+            assert client._tools
 
     @pytest.mark.asyncio
-    async def test_client_cleanup(self, client, mock_toolkit):
+    async def test_client_cleanup(self):
         """Test client cleans up resources."""
-        with patch("agent.mcp_integration.MCPToolkit", return_value=mock_toolkit):
-            async with client:
-                pass
-            # After context manager exits
-            assert client._toolkit is None
-            assert client._initialized is False
-            mock_toolkit.aclose.assert_called_once()
+        client = _make_client([_FakeTool("read_neo4j_cypher")])
+        async with client:
+            pass
+        # After context manager exits
+        assert client._tools is None
+        assert client._session is None
+        assert client._initialized is False
 
     @pytest.mark.asyncio
-    async def test_call_tool_success(self, client, mock_toolkit):
+    async def test_call_tool_success(self):
         """Test successful tool call."""
-        mock_tool = AsyncMock()
-        mock_tool.name = "run-cypher"
-        mock_tool.ainvoke.return_value = {"records": [], "summary": {}}
-        mock_toolkit.aget_tools.return_value = [mock_tool]
-
-        with patch("agent.mcp_integration.MCPToolkit", return_value=mock_toolkit):
-            async with client:
-                result = await client.call_tool("run-cypher", {"query": "MATCH (n) RETURN n"})
+        tool = _FakeTool("read_neo4j_cypher", {"records": [], "summary": {}})
+        client = _make_client([tool])
+        async with client:
+            result = await client.call_tool(
+                "read_neo4j_cypher", {"query": "MATCH (n) RETURN n"}
+            )
 
-                assert "records" in result
-                mock_tool.ainvoke.assert_called_once_with({"query": "MATCH (n) RETURN n"})
+            assert "records" in result
+            assert tool.calls == [{"query": "MATCH (n) RETURN n"}]
 
     @pytest.mark.asyncio
-    async def test_call_tool_not_found(self, client, mock_toolkit):
+    async def test_call_tool_not_found(self, initialized_client):
         """Test calling non-existent tool."""
-        mock_toolkit.aget_tools.return_value = []
-
-        with patch("agent.mcp_integration.MCPToolkit", return_value=mock_toolkit):
-            async with client:
-                with pytest.raises(ValueError, match="Tool 'nonexistent' not found"):
-                    await client.call_tool("nonexistent", {})
+        # call_tool wraps the lookup ValueError in a RuntimeError
+        with pytest.raises(RuntimeError, match="Tool 'nonexistent' not found"):
+            await initialized_client.call_tool("nonexistent", {})
 
     @pytest.mark.asyncio
-    async def test_call_tool_not_initialized(self, client):
+    async def test_call_tool_not_initialized(self):
         """Test calling tool on uninitialized client."""
-        with pytest.raises(RuntimeError, match="MCP client not initialized"):
+        client = _make_client()
+        with pytest.raises(RuntimeError, match="Client not initialized"):
             await client.call_tool("test", {})
 
     @pytest.mark.asyncio
-    async def test_get_available_tools(self, client, mock_toolkit):
+    async def test_get_available_tools(self, initialized_client):
         """Test getting available tools."""
-        mock_tools = [
-            MagicMock(name="run-cypher"),
-            MagicMock(name="get-schema")
-        ]
-        mock_toolkit.aget_tools.return_value = mock_tools
-
-        with patch("agent.mcp_integration.MCPToolkit", return_value=mock_toolkit):
-            async with client:
-                tools = await client.get_available_tools()
-                assert "run-cypher" in tools
-                assert "get-schema" in tools
+        tools = await initialized_client.get_available_tools()
+        assert "read_neo4j_cypher" in tools
+        assert "get_neo4j_schema" in tools
 
 
 class TestMCPGraphOperations:
@@ -98,8 +122,9 @@ class TestMCPGraphOperations:
     @pytest.fixture
     def mock_client(self):
         """Create mock MCP client."""
-        client = AsyncMock(spec=Neo4jMCPClient)
-        return client
+        # No spec= — nothing here relies on attribute-existence checking,
+        # and spec introspection costs a dir() walk per mock.
+        return AsyncMock()
 
     @pytest.fixture
     def graph_ops(self, mock_client):
@@ -115,7 +140,7 @@ class TestMCPGraphOperations:
         result = await graph_ops.get_schema()
 
         assert result == expected_schema
-        mock_client.call_tool.assert_called_once_with("get-schema", {})
+        mock_client.call_tool.assert_called_once_with("get_neo4j_schema", {})
 
     @pytest.mark.asyncio
     async def test_run_cypher_success(self, graph_ops, mock_client):
@@ -127,8 +152,8 @@ class TestMCPGraphOperations:
 
         assert result == expected_result
         mock_client.call_tool.assert_called_once_with(
-            "run-cypher",
-            {"query": "MATCH (n) RETURN n", "params": {}, "mode": "read"}
+            "read_neo4j_cypher",
+            {"query": "MATCH (n) RETURN n", "parameters": {}, "timeout": 30}
         )
 
     @pytest.mark.asyncio
@@ -143,8 +168,8 @@ class TestMCPGraphOperations:
         )
 
         mock_client.call_tool.assert_called_once_with(
-            "run-cypher",
-            {"query": "MATCH (n {id: $id}) RETURN n", "params": {"id": "node1"}, "mode": "write"}
+            "write_neo4j_cypher",
+            {"query": "MATCH (n {id: $id}) RETURN n", "parameters": {"id": "node1"}, "timeout": 30}
         )
 
     @pytest.mark.asyncio
@@ -253,8 +278,12 @@ class TestMCPGraphOperations:
             ]
         }
 
-        # Mock successful operations
-        mock_client.call_tool.return_value = {"success": True}
+        # Plain coroutine stub — no call assertions here, so skip the
+        # AsyncMock child-mock and call-history machinery entirely.
+        async def _ok_call_tool(tool_name, params):
+            return {"success": True}
+
+        mock_client.call_tool = _ok_call_tool
 
         result = await graph_ops.load_graph(graph_payload)
 
@@ -273,11 +302,16 @@ class TestMCPGraphOperations:
             "edges": []
         }
 
-        # Mock mixed results - first call succeeds, second fails
-        mock_client.call_tool.side_effect = [
-            {"success": True},
-            Exception("Invalid node data")
-        ]
+        # Mixed results - first call succeeds, second fails
+        responses = iter([{"success": True}, Exception("Invalid node data")])
+
+        async def _mixed_call_tool(tool_name, params):
+            result = next(responses)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        mock_client.call_tool = _mixed_call_tool
 
         result = await graph_ops.load_graph(graph_payload)
 
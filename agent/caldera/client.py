@@ -1,9 +1,11 @@
 ﻿from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 import httpx
+import orjson
 
 from .config import CalderaSettings
 from .exceptions import (
@@ -30,24 +32,24 @@ class CalderaClient:
             raise CalderaUnavailableError("Caldera integration is disabled in configuration")
 
         self.settings = settings
+        # Single source of truth for headers lives on the frozen settings
+        # model; keep a local alias for the per-request injected-client path.
+        self._default_headers = settings.default_headers
         self._owns_client = client is None
-        self._client = client or httpx.AsyncClient(
-            base_url=str(settings.base_url),
-            headers=self._default_headers,
-            verify=settings.verify_ssl,
-            timeout=httpx.Timeout(30.0, connect=settings.healthcheck_timeout_seconds),
-        )
-
-    @property
-    def _default_headers(self) -> Dict[str, str]:
-        headers: Dict[str, str] = {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-        }
-        if self.settings.api_key:
-            headers['KEY'] = self.settings.api_key
-            headers['Authorization'] = f'Bearer {self.settings.api_key}'
-        return headers
+        if client is None:
+            # Connect-level retries live in the transport, so transient
+            # connection failures are retried by httpx itself instead of
+            # bubbling up to application code.
+            client = httpx.AsyncClient(
+                base_url=str(settings.base_url),
+                headers=dict(self._default_headers),
+                transport=httpx.AsyncHTTPTransport(
+                    retries=settings.max_retry_attempts,
+                    verify=settings.verify_ssl,
+                ),
+                timeout=httpx.Timeout(30.0, connect=settings.healthcheck_timeout_seconds),
+            )
+        self._client = client
 
     async def __aenter__(self) -> 'CalderaClient':
         return self
@@ -68,7 +70,9 @@ class CalderaClient:
         json: Optional[Dict[str, Any]] = None,
     ) -> Any:
         url = path if path.startswith('/') else f'/{path}'
-        headers = self._default_headers
+        # The owned client already carries the default headers; only injected
+        # clients need them applied per request.
+        headers = None if self._owns_client else self._default_headers
         try:
             response = await self._client.request(method, url, params=params, json=json, headers=headers)
             if response.status_code in {401, 403}:
@@ -96,10 +100,18 @@ class CalderaClient:
 
     @staticmethod
     def _safe_json(response: httpx.Response) -> Any:
-        try:
-            return response.json()
-        except ValueError:
-            return {'raw': response.text}
+        # Check the content type before parsing: error pages from proxies and
+        # the Caldera UI are HTML, and raising/catching ValueError on every
+        # such body is pure overhead in the 5s-interval poll loops.
+        if 'json' in response.headers.get('content-type', ''):
+            try:
+                # orjson decodes the raw bytes directly and is several times
+                # faster than the stdlib path behind response.json() — this
+                # runs on every poll tick for agent lists and operation chains.
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                pass
+        return {'raw': response.text}
 
     async def ping(self) -> Any:
         """Basic health probe using the agents endpoint."""
@@ -147,6 +159,27 @@ class CalderaClient:
     async def get_link_result(self, link_id: str) -> Any:
         return await self._request('GET', f'/api/v2/links/{link_id}')
 
+    async def get_link_results_bulk(
+        self,
+        link_ids: Iterable[str],
+        *,
+        max_concurrency: int = 8,
+    ) -> List[Any]:
+        """Fetch link results concurrently, capped at max_concurrency in flight.
+
+        Returns one entry per link id in order; failed fetches yield the
+        exception instance in place so callers can skip or log them.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _fetch(link_id: str) -> Any:
+            async with semaphore:
+                return await self.get_link_result(link_id)
+
+        return await asyncio.gather(
+            *(_fetch(link_id) for link_id in link_ids), return_exceptions=True
+        )
+
     async def view_agent_abilities(self, paw: str) -> Any:
         payload: JSON = {'paw': paw}
         return await self._request('POST', '/plugin/access/abilities', json=payload)
@@ -167,4 +200,4 @@ class CalderaClient:
         if facts:
             payload['facts'] = facts
         logger.debug('Executing Caldera ability %s on agent %s', ability_id, paw)
-        return await self._request('POST', '/plugin/access/exploit', json=payload)
+        return await self._request('POST', '/plugin/access/exploit', json=payload)
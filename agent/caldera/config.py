@@ -1,10 +1,32 @@
 from __future__ import annotations
 
+import functools
 import os
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 from pydantic import BaseModel, Field, HttpUrl, validator
 
+_TRUE_VALUES = frozenset(('1', 'true', 'yes', 'on'))
+
+
+def _as_bool(value: Optional[str]) -> bool:
+    return (value or '').lower() in _TRUE_VALUES
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except (TypeError, ValueError):
+        return default
+
 
 class CalderaSettings(BaseModel):
     """Configuration block for MITRE Caldera integration."""
@@ -29,46 +51,61 @@ class CalderaSettings(BaseModel):
         frozen = True
 
     @validator('base_url')
-    def _strip_trailing_slash(cls, value: str) -> str:
-        return value.rstrip('/')
+    def _normalise_base_url(cls, value: 'HttpUrl | str') -> HttpUrl:
+        # Parse once here so every downstream consumer gets a validated
+        # HttpUrl instead of re-parsing a bare string; the trailing slash is
+        # stripped before parsing (httpx joins paths correctly either way).
+        if isinstance(value, str):
+            return HttpUrl(value.rstrip('/'))
+        return value
 
     @classmethod
     def from_env(cls) -> 'CalderaSettings':
-        """Construct settings from CALDERA_* environment variables."""
-        def _get(name: str, default: Optional[str] = None) -> Optional[str]:
-            return os.getenv(name, default)
-
-        enabled = _get('CALDERA_ENABLED', 'false').lower() in {'1', 'true', 'yes', 'on'}
-        base_url = _get('CALDERA_BASE_URL', 'http://127.0.0.1:8888')
-        api_key = _get('CALDERA_API_KEY') or None
-        verify_ssl = _get('CALDERA_VERIFY_SSL', 'false').lower() in {'1', 'true', 'yes', 'on'}
-
-        def _float(name: str, default: float) -> float:
-            try:
-                return float(_get(name, str(default)))
-            except (TypeError, ValueError):
-                return default
-
-        def _int(name: str, default: int) -> int:
-            try:
-                return int(_get(name, str(default)))
-            except (TypeError, ValueError):
-                return default
+        """Construct settings from CALDERA_* environment variables.
 
+        The instance is frozen and the environment does not change
+        mid-process, so the result is cached; tests that mutate CALDERA_*
+        variables should call ``_from_env_cached.cache_clear()``.
+        """
+        return _from_env_cached()
+
+    @classmethod
+    def _from_env(cls) -> 'CalderaSettings':
         return cls(
-            enabled=enabled,
-            base_url=base_url,
-            api_key=api_key,
-            verify_ssl=verify_ssl,
-            healthcheck_timeout_seconds=_float('CALDERA_HEALTHCHECK_TIMEOUT', 5.0),
-            healthcheck_interval_seconds=_float('CALDERA_HEALTHCHECK_INTERVAL', 60.0),
-            operation_poll_interval_seconds=_float('CALDERA_OPERATION_POLL_INTERVAL', 5.0),
-            operation_poll_timeout_seconds=_float('CALDERA_OPERATION_POLL_TIMEOUT', 900.0),
-            max_retry_attempts=_int('CALDERA_MAX_RETRY_ATTEMPTS', 3),
-            retry_backoff_seconds=_float('CALDERA_RETRY_BACKOFF', 2.0),
+            enabled=_as_bool(os.getenv('CALDERA_ENABLED', 'false')),
+            base_url=os.getenv('CALDERA_BASE_URL', 'http://127.0.0.1:8888'),
+            api_key=os.getenv('CALDERA_API_KEY') or None,
+            verify_ssl=_as_bool(os.getenv('CALDERA_VERIFY_SSL', 'false')),
+            healthcheck_timeout_seconds=_float_env('CALDERA_HEALTHCHECK_TIMEOUT', 5.0),
+            healthcheck_interval_seconds=_float_env('CALDERA_HEALTHCHECK_INTERVAL', 60.0),
+            operation_poll_interval_seconds=_float_env('CALDERA_OPERATION_POLL_INTERVAL', 5.0),
+            operation_poll_timeout_seconds=_float_env('CALDERA_OPERATION_POLL_TIMEOUT', 900.0),
+            max_retry_attempts=_int_env('CALDERA_MAX_RETRY_ATTEMPTS', 3),
+            retry_backoff_seconds=_float_env('CALDERA_RETRY_BACKOFF', 2.0),
         )
 
     @property
     def is_configured(self) -> bool:
         """Return True when Caldera should be considered usable."""
-        return self.enabled and bool(self.api_key or 'localhost' in str(self.base_url))
+        return self.enabled and bool(self.api_key or 'localhost' in str(self.base_url))
+
+    @functools.cached_property
+    def default_headers(self) -> Mapping[str, str]:
+        """Read-only HTTP headers for talking to this Caldera server.
+
+        Built once per instance (the model is frozen); shared by the REST
+        client and the health probes so the two cannot drift apart.
+        """
+        headers = {
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+        }
+        if self.api_key:
+            headers['KEY'] = self.api_key
+            headers['Authorization'] = f'Bearer {self.api_key}'
+        return MappingProxyType(headers)
+
+
+@functools.lru_cache(maxsize=1)
+def _from_env_cached() -> CalderaSettings:
+    return CalderaSettings._from_env()
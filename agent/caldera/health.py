@@ -5,25 +5,47 @@ import logging
 
 import httpx
 
+try:  # Resolved once at import instead of on every sync health check
+    import anyio
+except ModuleNotFoundError:  # pragma: no cover - anyio ships with httpx
+    anyio = None
+
 from .config import CalderaSettings
 from .exceptions import CalderaUnavailableError
 
 logger = logging.getLogger(__name__)
 
-
-def _default_headers(settings: CalderaSettings) -> dict[str, str]:
-    headers = {
-        'Accept': 'application/json',
-        'Content-Type': 'application/json',
-    }
-    if settings.api_key:
-        headers['KEY'] = settings.api_key
-        headers['Authorization'] = f'Bearer {settings.api_key}'
-    return headers
-
-
-async def check_caldera_health(settings: CalderaSettings) -> tuple[bool, str]:
-    """Probe Caldera and return (healthy, reason)."""
+# Health probes run on a recurring schedule; keep one client per settings
+# target alive between ticks instead of paying a TCP/TLS handshake each time.
+_HEALTH_CLIENT_CACHE: dict[tuple, httpx.AsyncClient] = {}
+_HEALTH_CLIENT_LOCK = asyncio.Lock()
+
+
+async def _get_health_client(settings: CalderaSettings) -> httpx.AsyncClient:
+    key = (str(settings.base_url), settings.api_key, settings.verify_ssl)
+    async with _HEALTH_CLIENT_LOCK:
+        client = _HEALTH_CLIENT_CACHE.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=str(settings.base_url),
+                headers=dict(settings.default_headers),
+                verify=settings.verify_ssl,
+                timeout=httpx.Timeout(settings.healthcheck_timeout_seconds, connect=settings.healthcheck_timeout_seconds),
+            )
+            _HEALTH_CLIENT_CACHE[key] = client
+        return client
+
+
+async def check_caldera_health(
+    settings: CalderaSettings,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> tuple[bool, str]:
+    """Probe Caldera and return (healthy, reason).
+
+    Pass ``client`` to reuse an existing pool (e.g. CalderaClient._client);
+    otherwise a cached per-target client is used and kept alive across probes.
+    """
     if not settings.enabled:
         return False, 'disabled'
 
@@ -31,14 +53,10 @@ async def check_caldera_health(settings: CalderaSettings) -> tuple[bool, str]:
         return False, 'missing api key or base url'
 
     try:
-        async with httpx.AsyncClient(
-            base_url=str(settings.base_url),
-            headers=_default_headers(settings),
-            verify=settings.verify_ssl,
-            timeout=httpx.Timeout(settings.healthcheck_timeout_seconds, connect=settings.healthcheck_timeout_seconds),
-        ) as client:
-            response = await client.get('/api/v2/agents')
-            response.raise_for_status()
+        if client is None:
+            client = await _get_health_client(settings)
+        response = await client.get('/api/v2/agents')
+        response.raise_for_status()
     except httpx.TimeoutException:
         logger.warning('Caldera health check timed out')
         return False, 'timeout'
@@ -60,9 +78,7 @@ async def ensure_caldera_available(settings: CalderaSettings) -> None:
 
 def ensure_caldera_available_sync(settings: CalderaSettings) -> None:
     """Synchronous helper for startup hooks."""
-    try:
-        import anyio
-
+    if anyio is not None:
         anyio.run(ensure_caldera_available, settings)
-    except ModuleNotFoundError:
-        asyncio.run(ensure_caldera_available(settings))
+    else:
+        asyncio.run(ensure_caldera_available(settings))
@@ -40,4 +40,11 @@ class AgentConfig(BaseModel):
 
 def load_config() -> AgentConfig:
     """Load agent configuration from environment variables."""
-    return AgentConfig.from_env()
+    return AgentConfig.from_env()
+
+
+__all__ = [
+    "AgentConfig",
+    "MCPToolConfig",
+    "load_config",
+]
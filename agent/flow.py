@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from functools import partial
 from pathlib import Path
@@ -35,6 +36,7 @@ class AgentApplication:
         self.system_message = system_message
         self.mcp_tools = mcp_tools or []
         self._mcp_client: Optional[Neo4jMCPClient] = None
+        self._warmup_task: Optional[asyncio.Task] = None
 
     async def get_mcp_client(self) -> Neo4jMCPClient:
         """Get or create MCP client for direct tool access."""
@@ -43,6 +45,8 @@ class AgentApplication:
         return self._mcp_client
 
     async def aclose(self) -> None:
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
         await self.tools.aclose()
         if self._mcp_client:
             await self._mcp_client.__aexit__(None, None, None)
@@ -124,6 +128,10 @@ async def create_application(config: Optional[AgentConfig] = None, *, llm: Optio
     logger.info("✅ LangGraph compiled successfully with persistence")
 
     app = AgentApplication(graph=graph, tools=tools, config=cfg, system_message=system_message, mcp_tools=mcp_tools)
+    # Warm the MCP client in the background so the first graph request does
+    # not pay the server spawn/handshake cost; keep a reference so the task
+    # is not garbage-collected mid-flight.
+    app._warmup_task = asyncio.create_task(tools.warmup())
     logger.info("✅ AgentApplication created successfully")
     return app
 
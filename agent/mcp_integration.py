@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import os
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Optional, List
 import asyncio
 import shlex
@@ -31,6 +32,20 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=512)
+def _sanitize_label(label: str) -> str:
+    """Normalise a single node label; cached since label sets are tiny."""
+    return label.strip()
+
+
+def _sanitize_labels(labels: Any) -> List[str]:
+    """Filter and sanitize a raw labels value into a usable label list."""
+    if not labels or not isinstance(labels, list):
+        return ["Node"]
+    sanitized = [_sanitize_label(label) for label in labels if isinstance(label, str) and label.strip()]
+    return sanitized or ["Node"]
+
+
 class Neo4jMCPClient:
     """Client for Neo4j operations using proper langchain-mcp-adapters pattern."""
 
@@ -45,6 +60,8 @@ class Neo4jMCPClient:
             self._mode = "mcp"
         elif NEO4J_AVAILABLE:
             self._driver = None
+            self._db_session = None
+            self._db_session_lock = asyncio.Lock()
             self._mode = "direct"
         else:
             self._mode = "mock"
@@ -221,6 +238,13 @@ class Neo4jMCPClient:
         if self._mode == "mcp":
             await self._close_mcp_stack()
         elif self._mode == "direct" and self._driver:
+            if self._db_session:
+                try:
+                    await self._db_session.close()
+                except Exception as e:
+                    logger.warning(f"Error closing Neo4j session: {e}")
+                finally:
+                    self._db_session = None
             try:
                 await self._driver.close()
             except Exception as e:
@@ -272,6 +296,17 @@ class Neo4jMCPClient:
         result = await tool.ainvoke(params)
         return result if isinstance(result, dict) else {"result": result}
 
+    def _get_direct_session(self):
+        """Get or lazily create the shared Neo4j session for direct mode.
+
+        The driver pools connections, but session objects still carry
+        per-call setup/teardown cost; reuse one session per client and
+        serialize access through ``self._db_session_lock``.
+        """
+        if self._db_session is None:
+            self._db_session = self._driver.session()
+        return self._db_session
+
     async def _call_direct_tool(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Call tool using direct Neo4j driver."""
         if tool_name in ("read_neo4j_cypher", "write_neo4j_cypher"):
@@ -280,7 +315,8 @@ class Neo4jMCPClient:
             mode = "write" if tool_name == "write_neo4j_cypher" else "read"
 
             if mode == "write":
-                async with self._driver.session() as session:
+                async with self._db_session_lock:
+                    session = self._get_direct_session()
                     result = await session.run(query, cypher_params)
                     data = await result.data()
                     summary = result.consume()
@@ -294,7 +330,8 @@ class Neo4jMCPClient:
                         }
                     }
             else:
-                async with self._driver.session() as session:
+                async with self._db_session_lock:
+                    session = self._get_direct_session()
                     result = await session.run(query, cypher_params)
                     data = await result.data()
                     return {
@@ -304,7 +341,8 @@ class Neo4jMCPClient:
 
         elif tool_name == "get_neo4j_schema":
             # Get schema information
-            async with self._driver.session() as session:
+            async with self._db_session_lock:
+                session = self._get_direct_session()
                 # Get node labels
                 labels_result = await session.run("CALL db.labels()")
                 labels = [record["label"] for record in await labels_result.data()]
@@ -351,6 +389,11 @@ class Neo4jMCPClient:
             return ["read_neo4j_cypher", "write_neo4j_cypher", "get_neo4j_schema"]
 
 
+# Cap on in-flight graph writes during bulk ingest; keeps us inside the
+# default Neo4j driver connection pool.
+_LOAD_GRAPH_CONCURRENCY = 8
+
+
 class MCPGraphOperations:
     """High-level graph operations using MCP protocol with proper error handling."""
 
@@ -391,20 +434,7 @@ class MCPGraphOperations:
         if not isinstance(node_data, dict):
             raise ValueError("Node data must be a dictionary")
 
-        labels = node_data.get("labels", ["Node"])
-        if not labels or not isinstance(labels, list):
-            labels = ["Node"]
-
-        # Sanitize labels
-        sanitized_labels = []
-        for label in labels:
-            if isinstance(label, str) and label.strip():
-                sanitized_labels.append(label.strip())
-
-        if not sanitized_labels:
-            sanitized_labels = ["Node"]
-
-        label_str = ":".join(sanitized_labels)
+        label_str = ":".join(_sanitize_labels(node_data.get("labels", ["Node"])))
         attrs = node_data.get("attrs", {})
 
         if not isinstance(attrs, dict):
@@ -510,8 +540,24 @@ class MCPGraphOperations:
         result = await self.run_cypher(query, {"edge_id": edge_id.strip()}, "write")
         return {"status": "deleted", "edge_id": edge_id, "result": result}
 
-    async def load_graph(self, graph_payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Load a complete graph from payload with proper transaction handling."""
+    async def load_graph(
+        self,
+        graph_payload: Dict[str, Any],
+        *,
+        session_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Load a complete graph using UNWIND-batched writes.
+
+        Nodes are grouped by label set and edges by type so each group costs
+        one round-trip and the Cypher planner compiles one plan per group,
+        instead of one CREATE per row. Groups are dispatched concurrently
+        (bounded), with the edge phase starting strictly after every node
+        group has settled so the edge MATCH never races a node CREATE.
+
+        When session_id is given, every created node and relationship is
+        stamped with it so /get_graph filtering and clear_session can scope
+        to one session's data.
+        """
         if not isinstance(graph_payload, dict):
             raise ValueError("Graph payload must be a dictionary")
 
@@ -529,26 +575,127 @@ class MCPGraphOperations:
             "errors": []
         }
 
-        # Create nodes first
+        node_groups: Dict[tuple, List[Dict[str, Any]]] = {}
         for node in nodes:
-            try:
-                await self.add_node(node)
-                results["nodes_created"] += 1
-            except Exception as e:
-                error_msg = f"Failed to create node {node.get('id', 'unknown')}: {e}"
+            labels = tuple(_sanitize_labels(node.get("labels", ["Node"])))
+            node_groups.setdefault(labels, []).append(node)
+
+        def _node_props(node: Dict[str, Any]) -> Dict[str, Any]:
+            attrs = node.get("attrs", {})
+            props = dict(attrs) if isinstance(attrs, dict) else {}
+            if "id" not in props and "id" in node:
+                props["id"] = node["id"]
+            if session_id is not None:
+                props["session_id"] = session_id
+            return props
+
+        async def _create_node_group(labels: tuple, group: List[Dict[str, Any]]) -> int:
+            query = f"""
+            UNWIND $rows AS row
+            CREATE (n:{':'.join(labels)})
+            SET n = row
+            RETURN count(n) AS created
+            """
+            await self.run_cypher(query, {"rows": [_node_props(n) for n in group]}, "write")
+            return len(group)
+
+        # Per-edge validation happens up front (mirroring add_edge) so a bad
+        # edge produces its own error entry instead of failing its group.
+        edge_groups: Dict[str, List[Dict[str, Any]]] = {}
+        for edge in edges:
+            missing = next((f for f in ("source", "target") if f not in edge), None)
+            if missing:
+                edge_id = f"{edge.get('source', '?')}->{edge.get('target', '?')}"
+                error_msg = f"Failed to create edge {edge_id}: Edge data missing required field: {missing}"
                 logger.error(error_msg)
                 results["errors"].append(error_msg)
+                continue
+            edge_type = edge.get("type", "RELATED")
+            if not isinstance(edge_type, str) or not edge_type.strip():
+                edge_type = "RELATED"
+            edge_groups.setdefault(edge_type.strip(), []).append(edge)
+
+        def _edge_row(edge: Dict[str, Any]) -> Dict[str, Any]:
+            attrs = edge.get("attrs", {})
+            props = dict(attrs) if isinstance(attrs, dict) else {}
+            if session_id is not None:
+                props["session_id"] = session_id
+            return {
+                "source_id": str(edge["source"]),
+                "target_id": str(edge["target"]),
+                "props": props,
+            }
 
-        # Create edges after nodes
-        for edge in edges:
-            try:
-                await self.add_edge(edge)
-                results["edges_created"] += 1
-            except Exception as e:
-                edge_id = f"{edge.get('source', '?')}->{edge.get('target', '?')}"
-                error_msg = f"Failed to create edge {edge_id}: {e}"
+        async def _create_edge_group(edge_type: str, group: List[Dict[str, Any]]) -> int:
+            query = """
+            UNWIND $rows AS row
+            MATCH (source {id: row.source_id}), (target {id: row.target_id})
+            CREATE (source)-[r:RELATIONSHIP]->(target)
+            SET r.type = $edge_type, r += row.props
+            RETURN count(r) AS created
+            """
+            await self.run_cypher(query, {
+                "rows": [_edge_row(e) for e in group],
+                "edge_type": edge_type,
+            }, "write")
+            return len(group)
+
+        # Bounded concurrency across groups keeps us inside the Neo4j pool
+        semaphore = asyncio.Semaphore(_LOAD_GRAPH_CONCURRENCY)
+
+        async def _bounded(coro):
+            async with semaphore:
+                return await coro
+
+        node_items = list(node_groups.items())
+        node_outcomes = await asyncio.gather(
+            *(_bounded(_create_node_group(labels, group)) for labels, group in node_items),
+            return_exceptions=True,
+        )
+        for (labels, group), outcome in zip(node_items, node_outcomes):
+            if isinstance(outcome, Exception):
+                ids = ", ".join(str(n.get("id", "unknown")) for n in group)
+                error_msg = f"Failed to create nodes {ids}: {outcome}"
+                logger.error(error_msg)
+                results["errors"].append(error_msg)
+            else:
+                results["nodes_created"] += outcome
+
+        edge_items = list(edge_groups.items())
+        edge_outcomes = await asyncio.gather(
+            *(_bounded(_create_edge_group(edge_type, group)) for edge_type, group in edge_items),
+            return_exceptions=True,
+        )
+        for (edge_type, group), outcome in zip(edge_items, edge_outcomes):
+            if isinstance(outcome, Exception):
+                ids = ", ".join(
+                    f"{e.get('source', '?')}->{e.get('target', '?')}" for e in group
+                )
+                error_msg = f"Failed to create edges {ids}: {outcome}"
                 logger.error(error_msg)
                 results["errors"].append(error_msg)
+            else:
+                results["edges_created"] += outcome
 
         return results
 
+    async def clear_session(self, session_id: str) -> Dict[str, Any]:
+        """Delete every node (and its relationships) stamped with session_id."""
+        if not session_id or not isinstance(session_id, str):
+            raise ValueError("Session ID must be a non-empty string")
+
+        query = """
+        MATCH (n {session_id: $session_id})
+        DETACH DELETE n
+        RETURN count(n) as deleted_count
+        """
+
+        result = await self.run_cypher(query, {"session_id": session_id.strip()}, "write")
+        deleted_count = 0
+        if isinstance(result, dict):
+            records = result.get("records") or []
+            if records and isinstance(records[0], dict):
+                deleted_count = records[0].get("deleted_count", 0)
+        return {"status": "cleared", "session_id": session_id,
+                "deleted_count": deleted_count, "result": result}
+
@@ -231,7 +231,7 @@ async def monitor_job(state: AgentState, tools: ToolRegistry) -> Dict[str, Any]:
     }
 
     status = status_mapping.get(simulation_job.status.value, ScenarioStatus.PENDING)
-    updated_job = job.model_copy(update={"status": status})
+    job_updates: Dict[str, Any] = {"status": status}
 
     # Generate detailed status message
     recent_events = simulation_job.events[-3:] if simulation_job.events else []
@@ -266,7 +266,7 @@ async def monitor_job(state: AgentState, tools: ToolRegistry) -> Dict[str, Any]:
         )
 
         # Store findings in the job
-        updated_job = updated_job.model_copy(update={"findings": findings})
+        job_updates["findings"] = findings
 
     elif simulation_job.status.value == "failed":
         error_events = [e for e in simulation_job.events if e.severity in ["ERROR", "CRITICAL"]]
@@ -285,6 +285,9 @@ async def monitor_job(state: AgentState, tools: ToolRegistry) -> Dict[str, Any]:
 
     message = AIMessage(content=message_content)
 
+    # Single copy per poll tick; branches only accumulate field updates
+    updated_job = job.model_copy(update=job_updates)
+
     # Update context
     context_updates = {
         "last_job_id": job.job_id,
@@ -395,15 +395,16 @@ class CalderaPlatformAdapter(PlatformAdapter):
         client = self._ensure_client()
         operation = ctx.get('final_operation') or await client.get_operation(ctx['operation_id'])
         links = await client.get_operation_links(ctx['operation_id'])
+        # Fetch link details concurrently instead of one RTT per link
+        link_ids = [link.get('id') for link in links if link.get('id')]
         artifacts = []
-        for link in links:
-            link_id = link.get('id')
-            if link_id:
-                try:
-                    detail = await client.get_link_result(link_id)
+        if link_ids:
+            results = await client.get_link_results_bulk(link_ids)
+            for link_id, detail in zip(link_ids, results):
+                if isinstance(detail, Exception):
+                    self.logger.debug('Failed to fetch link %s detail: %s', link_id, detail)
+                else:
                     artifacts.append(detail)
-                except Exception as exc:  # noqa: BLE001
-                    self.logger.debug('Failed to fetch link %s detail: %s', link_id, exc)
         report = {
             'operation': operation,
             'links': links,
@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+import os
 import time
 from typing import Any, Dict, Iterable, List, Optional
 
@@ -14,6 +15,25 @@ from .models import ToolCallResult
 
 logger = logging.getLogger(__name__)
 
+# Process-wide cache of initialized MCP clients keyed by connection target.
+# Every ToolRegistry used to spawn its own MCP server subprocess; with the
+# cache, N registries share one connection and the last release closes it.
+_MCP_CLIENT_CACHE: Dict[tuple, Neo4jMCPClient] = {}
+_MCP_CLIENT_REFCOUNTS: Dict[tuple, int] = {}
+_MCP_CACHE_LOCK = asyncio.Lock()
+
+
+def _mcp_cache_key() -> tuple:
+    """Connection identity for the cached MCP client.
+
+    Neo4jMCPClient reads its target from the environment, so the cache key
+    mirrors the same variables.
+    """
+    return (
+        os.getenv("GRAPH_NEO4J_URI", "bolt://localhost:7687"),
+        os.getenv("GRAPH_NEO4J_USER", "neo4j"),
+    )
+
 
 class MCPToolConfig(BaseModel):
     """Configuration schema for external MCP HTTP tools."""
@@ -31,22 +51,34 @@ class MCPToolClient:
     def __init__(self, config: MCPToolConfig):
         self.name = config.name
         self._config = config
-        self._client = httpx.AsyncClient(
-            base_url=config.base_url,
-            timeout=config.timeout_seconds,
-            verify=config.verify_ssl,
-        )
+        # Connection pool is created lazily on first invoke() so registering
+        # N tools does not allocate N pools for tools that never get called.
+        self._client: Optional[httpx.AsyncClient] = None
+        self._init_lock = asyncio.Lock()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the HTTP client, double-checked under the init lock."""
+        if self._client is None:
+            async with self._init_lock:
+                if self._client is None:
+                    self._client = httpx.AsyncClient(
+                        base_url=self._config.base_url,
+                        timeout=self._config.timeout_seconds,
+                        verify=self._config.verify_ssl,
+                    )
+        return self._client
 
     async def invoke(self, endpoint: str, payload: Dict[str, Any]) -> ToolCallResult:
         """Invoke a tool endpoint with JSON payload."""
+        client = await self._get_client()
         headers = {"Content-Type": "application/json"}
         if self._config.api_key:
             headers["Authorization"] = f"Bearer {self._config.api_key}"
 
         url = endpoint if endpoint.startswith("/") else f"/{endpoint}"
-        start = time.perf_counter()
-        response = await self._client.post(url, json=payload, headers=headers)
-        elapsed_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter_ns()
+        response = await client.post(url, json=payload, headers=headers)
+        elapsed_ms = (time.perf_counter_ns() - start) / 1_000_000
 
         if response.status_code >= 400:
             raise RuntimeError(
@@ -68,7 +100,9 @@ class MCPToolClient:
         )
 
     async def aclose(self) -> None:
-        await self._client.aclose()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 
 class ToolRegistry:
@@ -90,6 +124,7 @@ class ToolRegistry:
         self._caldera_settings = caldera_settings
         self._caldera_client: Optional[CalderaClient] = None
         self._mcp_client: Optional[Neo4jMCPClient] = None
+        self._mcp_cache_key: Optional[tuple] = None
         self._mcp_operations: Optional[MCPGraphOperations] = None
         self._mcp_init_lock = asyncio.Lock()  # Prevent race conditions during initialization
 
@@ -134,17 +169,32 @@ class ToolRegistry:
 
     async def get_mcp_client(self) -> Neo4jMCPClient:
         """Get or create the stdio-based MCP client for direct operations with proper async initialization."""
-        # Note: Lock is handled by caller (get_mcp_operations) to avoid deadlock
+        # Note: Registry-level lock is handled by caller (get_mcp_operations)
+        # to avoid deadlock; the module lock below serializes cache access.
         if not self._mcp_client:
-            try:
-                client = Neo4jMCPClient()
-                # Initialize transport with proper error handling
-                await client.__aenter__()
+            key = _mcp_cache_key()
+            async with _MCP_CACHE_LOCK:
+                cached = _MCP_CLIENT_CACHE.get(key)
+                if cached:
+                    _MCP_CLIENT_REFCOUNTS[key] += 1
+                    self._mcp_client = cached
+                    self._mcp_cache_key = key
+                    logger.info("Reusing cached Neo4j MCP client for %s", key[0])
+                    return self._mcp_client
+
+                try:
+                    client = Neo4jMCPClient()
+                    # Initialize transport with proper error handling
+                    await client.__aenter__()
+                except Exception as e:
+                    logger.error(f"Failed to initialize MCP client: {e}", exc_info=True)
+                    raise RuntimeError(f"MCP client initialization failed: {e}") from e
+
+                _MCP_CLIENT_CACHE[key] = client
+                _MCP_CLIENT_REFCOUNTS[key] = 1
                 self._mcp_client = client
+                self._mcp_cache_key = key
                 logger.info("Created and initialized new Neo4j MCP client")
-            except Exception as e:
-                logger.error(f"Failed to initialize MCP client: {e}", exc_info=True)
-                raise RuntimeError(f"MCP client initialization failed: {e}") from e
         return self._mcp_client
 
     async def get_mcp_operations(self) -> MCPGraphOperations:
@@ -160,6 +210,18 @@ class ToolRegistry:
                     raise RuntimeError(f"MCP operations creation failed: {e}") from e
         return self._mcp_operations
 
+    async def warmup(self) -> None:
+        """Eagerly initialize the MCP client and operations helper.
+
+        Intended to run fire-and-forget at application bootstrap so the
+        first graph request does not pay the MCP server spawn/handshake
+        cost. Failures are logged, not raised — the lazy path will retry.
+        """
+        results = await asyncio.gather(self.get_mcp_operations(), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Tool registry warmup failed: %s", result)
+
     async def aclose(self) -> None:
         """Close all clients and clean up resources."""
         # Close HTTP tool clients
@@ -170,13 +232,25 @@ class ToolRegistry:
             await asyncio.gather(*close_tasks, return_exceptions=True)
         self._clients.clear()
 
-        # Close MCP client properly
+        # Release the shared MCP client; close it only on the last reference
         if self._mcp_client:
-            try:
-                await self._mcp_client.__aexit__(None, None, None)
-                logger.info("MCP client closed")
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.warning("Error closing MCP client: %s", exc)
+            key = self._mcp_cache_key
+            async with _MCP_CACHE_LOCK:
+                remaining = _MCP_CLIENT_REFCOUNTS.get(key, 1) - 1 if key else 0
+                if key and remaining > 0:
+                    _MCP_CLIENT_REFCOUNTS[key] = remaining
+                    close_client = False
+                else:
+                    if key:
+                        _MCP_CLIENT_CACHE.pop(key, None)
+                        _MCP_CLIENT_REFCOUNTS.pop(key, None)
+                    close_client = True
+            if close_client:
+                try:
+                    await self._mcp_client.__aexit__(None, None, None)
+                    logger.info("MCP client closed")
+                except Exception as exc:  # pragma: no cover - defensive
+                    logger.warning("Error closing MCP client: %s", exc)
 
         if self._caldera_client:
             try:
@@ -187,6 +261,7 @@ class ToolRegistry:
 
         self._caldera_client = None
         self._mcp_client = None
+        self._mcp_cache_key = None
         self._mcp_operations = None
         logger.info("Tool registry closed")
 